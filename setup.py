@@ -70,6 +70,6 @@ setup(
     },
     package_dir={"uge2slurm.commands": "uge2slurm/commands"},
     package_data={
-        "uge2slurm.commands": ["wrapper/*.sh"]
+        "uge2slurm.commands": ["wrapper/*.sh", "wrapper/*.mk"]
     }
 )
@@ -0,0 +1,115 @@
+from __future__ import print_function, absolute_import
+
+import sys
+import logging
+from subprocess import PIPE
+from multiprocessing.pool import ThreadPool
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.log import print_command
+from uge2slurm.utils.path import get_command_path
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.py2.subprocess import run
+from uge2slurm.utils.joblist import ARGV_LIMIT, resolve_job_list, format_job_id, chunk_arguments
+
+logger = logging.getLogger(__name__)
+
+
+def set_common_control_args(parser):
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="Print the scontrol commands instead of executing them.")
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="Number of scontrol commands executed in parallel (default: 4).")
+
+
+def get_job_list(values):
+    """Flatten job lists given by spaces or commas."""
+    return [job for item in values or () for job in item.split(',') if job]
+
+
+def _run_chunk(command):
+    res = run(command, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+    return res.returncode, res.stderr or ''
+
+
+def _find_failures(ids, stderr):
+    """Map ids mentioned in scontrol error messages to the messages."""
+    failures = {}
+    id_set = set(ids)
+    for line in stderr.splitlines():
+        for token in line.replace(',', ' ').replace(':', ' ').replace('=', ' ').split():
+            if token in id_set:
+                failures[token] = line.strip()
+    return failures
+
+
+def _make_command(action, ids, fields):
+    if action == "update":
+        return [action, "JobId=" + ','.join(ids)] + list(fields)
+    return [action, ','.join(ids)]
+
+
+def control_jobs(action, ids, workers=4, dry_run=False, fields=()):
+    """
+    Run `scontrol <action> <job_list>` (or `scontrol update JobId=<job_list> <fields>`)
+    for chunks of job ids on a thread pool. Return a dict of failed ids and
+    error messages. If scontrol fails without telling which jobs, all ids of
+    the chunk are regarded as failed.
+    """
+    limit = ARGV_LIMIT - sum(len(field) + 1 for field in fields)
+    chunks = list(chunk_arguments(ids, limit))
+    if dry_run:
+        for chunk in chunks:
+            print_command(["scontrol"] + _make_command(action, chunk, fields))
+        return {}
+
+    binary = get_command_path("scontrol")
+    if not binary:
+        raise UGE2slurmCommandError("Command `scontrol` not found.")
+
+    failures = {}
+    pool = ThreadPool(max(1, min(workers, len(chunks))))
+    try:
+        commands = [[binary] + _make_command(action, chunk, fields) for chunk in chunks]
+        for chunk, (retcode, stderr) in zip(chunks, pool.imap(_run_chunk, commands)):
+            if not retcode:
+                continue
+            found = _find_failures(chunk, stderr)
+            if not found:
+                message = stderr.strip() or "scontrol exited with {}".format(retcode)
+                found = dict((job_id, message) for job_id in chunk)
+            failures.update(found)
+    finally:
+        pool.terminate()
+
+    return failures
+
+
+def run_job_control(args, action, job_list, message, fields=()):
+    """
+    Resolve UGE job lists by `-t` and `-u` options and apply `scontrol <action>`.
+    `message` is formatted with `job` for each succeeded job.
+    """
+    jobs, missing = resolve_job_list(job_list, getattr(args, 't', None), getattr(args, 'u', None))
+    for item in missing:
+        print('denied: job "{}" does not exist'.format(item), file=sys.stderr)
+
+    ids = [format_job_id(job_id, tasks) for job_id, tasks in jobs.items()]
+    if not ids:
+        return 1
+
+    failures = control_jobs(action, ids, args.workers, args.dry_run, fields)
+    if args.dry_run:
+        return
+
+    with ChunkedWriter() as writer:
+        for job_id in ids:
+            if job_id not in failures:
+                writer.write(message.format(job=job_id) + '\n')
+
+    for job_id in ids:
+        if job_id in failures:
+            logger.error("job {}: {}".format(job_id, failures[job_id]))
+
+    if missing or failures:
+        return 1
@@ -1,10 +1,176 @@
+from __future__ import print_function
+
+import time
 import logging
+from fnmatch import fnmatchcase
+
+from uge2slurm.utils.log import entrypoint
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.sacct import iter_records
+from uge2slurm.utils.acctdb import open_database
+from uge2slurm.utils.hostlist import expand_hostlist
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from .argparser import get_parser, parser_args
+from .summary import GROUP_KEYS, Summary, format_record
+from .efficiency import EfficiencyReport
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = "1970-01-01T00:00:00"
+# (option dest, sacct option, record key) used to filter records when a value is given
+_FILTER_OPTIONS = (
+    ('A', "--accounts", "account"),
+    ('g', "--group", "group"),
+    ('h', "--nodelist", "hostname"),
+    ('o', "--user", "owner"),
+    ('P', "--wckeys", "project"),
+    ('q', "--partition", "queue")
+)
+_WILDCARDS = "*?["
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qacct", "sacct")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    begin, end = _get_time_range(args)
+    records = _filter_records(_iter_source_records(args, begin, end), args, begin, end)
+
+    if args.j is not None:
+        with ChunkedWriter() as writer:
+            for record in records:
+                writer.write(format_record(record) + '\n')
+        return
+
+    if args.efficiency:
+        summary = EfficiencyReport()
+    else:
+        group_keys = [group_key for group_key in GROUP_KEYS if getattr(args, group_key[0]) is not None]
+        summary = Summary(group_keys)
+    for record in records:
+        summary.add(record)
+    print(summary.format())
+
+
+def _get_time_range(args):
+    begin = None
+    if args.b is not None:
+        begin = time.mktime(args.b.timetuple())
+    if args.d is not None:
+        days_ago = time.time() - args.d * 86400
+        begin = days_ago if begin is None else max(begin, days_ago)
+
+    end = None
+    if args.e is not None:
+        end = time.mktime(args.e.timetuple())
+
+    return begin, end
+
+
+def _format_time(value):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(value))
+
+
+def _get_sacct_args(args, begin, end):
+    sacct_args = ["--starttime", _EPOCH if begin is None else _format_time(begin)]
+    if end is not None:
+        sacct_args += ["--endtime", _format_time(end)]
+
+    if args.o is None or args.o is True:
+        sacct_args.append("--allusers")
+
+    for dest, option, _ in _FILTER_OPTIONS:
+        value = getattr(args, dest)
+        if value is not None and value is not True:
+            sacct_args += [option, value]
+
+    if args.j is not None and args.j is not True:
+        if args.j.isdigit():
+            sacct_args += ["--jobs", args.j]
+        elif not any(c in args.j for c in _WILDCARDS):
+            sacct_args += ["--name", args.j]
+
+    return sacct_args
+
+
+def _iter_source_records(args, begin, end):
+    """
+    Read records from the local accounting database if it covers the period,
+    and from `sacct` only for the rest of them.
+    """
+    database = None if args.direct else open_database(args.database)
+    coverage = None if database is None else database.get_coverage()
+    if coverage is None or begin is None or begin < coverage[0]:
+        if database is not None:
+            logger.info("local accounting database does not cover the period. use sacct.")
+            database.close()
+        for record in iter_records(_get_sacct_args(args, begin, end)):
+            yield record
+        return
+
+    watermark = coverage[1]
+    try:
+        equals, globs = _get_database_filters(args)
+        for record in database.iter_records(begin, end, watermark, equals, globs):
+            yield record
+    finally:
+        database.close()
+
+    if end is not None and end < watermark:
+        return
+    for record in iter_records(_get_sacct_args(args, max(begin, watermark), end)):
+        if record["end"] is None or record["end"] >= watermark:
+            yield record
+
+
+def _get_database_filters(args):
+    equals = {}
+    for dest, _, key in _FILTER_OPTIONS:
+        value = getattr(args, dest)
+        # hosts are matched by `_filter_records` since records have hostlists
+        if value is not None and value is not True and dest != 'h':
+            equals[key] = value
+
+    globs = {}
+    if args.j is not None and args.j is not True:
+        if args.j.isdigit():
+            equals["jobid"] = args.j
+        elif any(c in args.j for c in _WILDCARDS):
+            globs["jobname"] = args.j
+        else:
+            equals["jobname"] = args.j
+
+    return equals, globs
+
+
+def _filter_records(records, args, begin, end):
+    pattern = None
+    if args.j is not None and args.j is not True and not args.j.isdigit():
+        pattern = args.j
+    hosts = None
+    if args.h is not None and args.h is not True:
+        hosts = set(expand_hostlist(args.h))
+
+    for record in records:
+        # only finished jobs are accounted
+        if record["end"] is None or record["start"] is None:
+            continue
+        if begin is not None and record["start"] < begin:
+            continue
+        if end is not None and record["start"] > end:
+            continue
+        if pattern is not None and not fnmatchcase(record["jobname"], pattern):
+            continue
+        if hosts is not None and hosts.isdisjoint(expand_hostlist(record["hostname"] or '')):
+            continue
+        yield record
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,60 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args, parse_ge_datetime
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import singlearg
+
+parser_args = dict(
+    description="Mapping UGE qacct command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_orig_arguments(parser)
+
+    uge = parser.add_argument_group(
+        title="qacct options",
+        description="UGE qacct options"
+    )
+    set_qacct_arguments(uge)
+
+
+def set_orig_arguments(parser):
+    set_common_args(parser)
+    parser.add_argument(
+        "--database", metavar="path",
+        help="Path to the local accounting database synced by `uge2slurm acct "
+             "sync`. Default is ~/.uge2slurm/acct.sqlite"
+    )
+    parser.add_argument(
+        "--direct", action="store_true",
+        help="Query `sacct` directly without the local accounting database."
+    )
+    parser.add_argument(
+        "--efficiency", action="store_true",
+        help="Report CPU and memory utilisation percentiles grouped by owner, "
+             "job name and queue instead of usage summary."
+    )
+
+
+def set_qacct_arguments(uge):
+    uge.add_argument("-A", nargs='?', const=True, metavar="account_string")
+    uge.add_argument("-b", nargs=1, action=singlearg, metavar="begin_time", type=parse_ge_datetime)
+    uge.add_argument("-d", nargs=1, action=singlearg, metavar="days", type=int)
+    uge.add_argument("-e", nargs=1, action=singlearg, metavar="end_time", type=parse_ge_datetime)
+    uge.add_argument("-g", nargs='?', const=True, metavar="groupid|groupname")
+    uge.add_argument("-h", nargs='?', const=True, metavar="host")
+    uge.add_argument("-j", nargs='?', const=True, metavar="job_id|job_name|pattern")
+    uge.add_argument("-o", nargs='?', const=True, metavar="owner")
+    uge.add_argument("-P", nargs='?', const=True, metavar="project")
+    uge.add_argument("-q", nargs='?', const=True, metavar="wc_queue")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
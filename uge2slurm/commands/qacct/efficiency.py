@@ -0,0 +1,93 @@
+from array import array
+
+_GIGA = 1024. ** 3
+_PERCENTILES = (50, 90)
+_KEY_FORMAT = "{:<12.12} {:<20.20} {:<12.12} "
+_HEADER = (_KEY_FORMAT.format("OWNER", "JOBNAME", "QUEUE") +
+           "{:>7} {:>8} {:>8} {:>8} {:>8} {:>9} {:>9} {:>12}".format(
+               "JOBS", "CPU_P50", "CPU_P90", "MEM_P50", "MEM_P90", "REQ_MEM", "RSS_P90", "WASTED_CPUH"))
+_ROW_FORMAT = "{:>7} {:>8} {:>8} {:>8} {:>8} {:>9} {:>9} {:>12.1f}"
+
+
+def percentile(values, q):
+    """Linear interpolated percentile of sorted values."""
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100.
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class _Efficiency(object):
+    __slots__ = ("cpu_efficiency", "memory_efficiency", "request_memory", "maxrss", "wasted_cpu")
+
+    def __init__(self):
+        self.cpu_efficiency = array('d')
+        self.memory_efficiency = array('d')
+        self.request_memory = array('d')
+        self.maxrss = array('d')
+        self.wasted_cpu = 0.
+
+    def add(self, record):
+        allocated = (record["wallclock"] or 0) * (record["slots"] or 1)
+        if allocated:
+            cpu = record["cpu"] or 0.
+            self.cpu_efficiency.append(cpu / allocated)
+            self.wasted_cpu += max(allocated - cpu, 0.)
+
+        if record["reqmem"] and record["maxrss"] is not None:
+            self.memory_efficiency.append(float(record["maxrss"]) / record["reqmem"])
+            self.request_memory.append(record["reqmem"])
+            self.maxrss.append(record["maxrss"])
+
+    def __len__(self):
+        return max(len(self.cpu_efficiency), len(self.memory_efficiency))
+
+
+def _format_ratio(value):
+    return '-' if value is None else "{:.1%}".format(value)
+
+
+def _format_gigabytes(value):
+    return '-' if value is None else "{:.2f}G".format(value / _GIGA)
+
+
+class EfficiencyReport(object):
+    """
+    Collect CPU and memory utilisation per owner, job name and queue.
+    Values are kept in compact `array`s and sorted once per group when the
+    report is formatted.
+    """
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, record):
+        key = (record["owner"], record["jobname"], record["queue"])
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _Efficiency()
+        group.add(record)
+
+    def format(self):
+        lines = [_HEADER, '=' * len(_HEADER)]
+        for key, group in sorted(self.groups.items(), key=lambda kv: -kv[1].wasted_cpu):
+            cpu_efficiency = sorted(group.cpu_efficiency)
+            memory_efficiency = sorted(group.memory_efficiency)
+            request_memory = sorted(group.request_memory)
+            maxrss = sorted(group.maxrss)
+
+            cpu_percentiles = [_format_ratio(percentile(cpu_efficiency, q)) for q in _PERCENTILES]
+            memory_percentiles = [_format_ratio(percentile(memory_efficiency, q)) for q in _PERCENTILES]
+
+            lines.append(
+                _KEY_FORMAT.format(*(v or "NONE" for v in key)) + _ROW_FORMAT.format(
+                    len(group),
+                    *(cpu_percentiles + memory_percentiles + [
+                        _format_gigabytes(percentile(request_memory, 50)),
+                        _format_gigabytes(percentile(maxrss, 90)),
+                        group.wasted_cpu / 3600.
+                    ])
+                )
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,133 @@
+from datetime import datetime
+
+from uge2slurm.utils.units import format_memory
+
+_GIGA = 1024. ** 3
+
+# (option dest, record key, column name)
+GROUP_KEYS = (
+    ('h', "hostname", "HOSTNAME"),
+    ('q', "queue", "CLUSTER QUEUE"),
+    ('g', "group", "GROUP"),
+    ('o', "owner", "OWNER"),
+    ('P', "project", "PROJECT"),
+    ('A', "account", "ACCOUNT")
+)
+_USAGE_COLUMNS = ("WALLCLOCK", "UTIME", "STIME", "CPU", "MEMORY", "IO", "IOW")
+_KEY_FORMAT = "{:<15.15} "
+_USAGE_FORMAT = "{:>13} {:>13.3f} {:>13.3f} {:>13.3f} {:>18.3f} {:>18.3f} {:>18.3f}"
+_USAGE_HEADER = "{:>13} {:>13} {:>13} {:>13} {:>18} {:>18} {:>18}".format(*_USAGE_COLUMNS)
+
+
+class Usage(object):
+    __slots__ = ("wallclock", "utime", "stime", "cpu", "mem", "io", "iow")
+
+    def __init__(self):
+        self.wallclock = 0
+        self.utime = 0.
+        self.stime = 0.
+        self.cpu = 0.
+        self.mem = 0.
+        self.io = 0.
+        self.iow = 0.
+
+    def add(self, record):
+        self.wallclock += record["wallclock"] or 0
+        self.utime += record["utime"] or 0.
+        self.stime += record["stime"] or 0.
+        self.cpu += record["cpu"] or 0.
+        self.mem += get_memory_usage(record)
+
+    def format(self):
+        return _USAGE_FORMAT.format(self.wallclock, self.utime, self.stime, self.cpu,
+                                    self.mem, self.io, self.iow)
+
+
+def get_memory_usage(record):
+    """
+    Approximate UGE's integral memory usage (GB * CPU seconds) by the maximum
+    resident set size and the total CPU time.
+    """
+    if not record["maxrss"] or not record["cpu"]:
+        return 0.
+    return record["maxrss"] / _GIGA * record["cpu"]
+
+
+class Summary(object):
+    """Aggregate usages incrementally by the given record keys."""
+    def __init__(self, group_keys):
+        self.group_keys = group_keys
+        self.usages = {}
+
+    def add(self, record):
+        key = tuple(record[k] for _, k, _ in self.group_keys)
+        usage = self.usages.get(key)
+        if usage is None:
+            usage = self.usages[key] = Usage()
+        usage.add(record)
+
+    def format(self):
+        if not self.group_keys:
+            usage = self.usages.get((), Usage())
+            header = _USAGE_HEADER
+            lines = ["Total System Usage", header, '=' * len(header), usage.format()]
+            return '\n'.join(lines)
+
+        header = ''.join(_KEY_FORMAT.format(name) for _, _, name in self.group_keys) + _USAGE_HEADER
+        lines = [header, '=' * len(header)]
+        for key in sorted(self.usages, key=lambda k: tuple('' if v is None else v for v in k)):
+            lines.append(
+                ''.join(_KEY_FORMAT.format(v or "NONE") for v in key) + self.usages[key].format()
+            )
+        return '\n'.join(lines)
+
+
+def _format_time(value):
+    if value is None:
+        return "-/-"
+    return datetime.fromtimestamp(value).strftime("%a %b %d %H:%M:%S %Y")
+
+
+def _get_exit_status(exit_code):
+    code, _, signal = (exit_code or "0:0").partition(':')
+    if signal and signal != '0':
+        return 128 + int(signal)
+    return int(code or 0)
+
+
+def format_record(record):
+    state = record["state"] or ''
+    fields = (
+        ("qname", record["queue"]),
+        ("hostname", record["hostname"]),
+        ("group", record["group"]),
+        ("owner", record["owner"]),
+        ("project", record["project"] or "NONE"),
+        ("department", "defaultdepartment"),
+        ("jobname", record["jobname"]),
+        ("jobnumber", record["jobid"]),
+        ("taskid", "undefined" if record["taskid"] is None else record["taskid"]),
+        ("account", record["account"]),
+        ("priority", record["priority"]),
+        ("qsub_time", _format_time(record["submit"])),
+        ("start_time", _format_time(record["start"])),
+        ("end_time", _format_time(record["end"])),
+        ("granted_pe", "NONE"),
+        ("slots", record["slots"]),
+        ("failed", 0 if state.startswith(("COMPLETED", "FAILED")) else "100 : " + state),
+        ("exit_status", _get_exit_status(record["exit_code"])),
+        ("ru_wallclock", "{}s".format(record["wallclock"] or 0)),
+        ("ru_utime", "{:.3f}s".format(record["utime"] or 0.)),
+        ("ru_stime", "{:.3f}s".format(record["stime"] or 0.)),
+        ("ru_maxrss", format_memory(record["maxrss"])),
+        ("cpu", "{:.3f}s".format(record["cpu"] or 0.)),
+        ("mem", "{:.3f}GBs".format(get_memory_usage(record))),
+        ("io", "0.000GB"),
+        ("iow", "0.000s"),
+        ("maxvmem", format_memory(record["maxvmem"])),
+    )
+
+    lines = ['=' * 62]
+    for key, value in fields:
+        lines.append("{:<13}{}".format(key, value))
+    return '\n'.join(lines)
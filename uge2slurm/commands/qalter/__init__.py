@@ -1,10 +1,50 @@
+from __future__ import print_function
+
+import getpass
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.commands.jobcontrol import get_job_list, run_job_control
+from uge2slurm.utils.log import entrypoint
+
+from .argparser import get_parser, parser_args
+from .mapper import AlterMapper
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qalter", "scontrol update")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    job_list = get_job_list(args.command)
+    if not job_list and args.u is None:
+        raise UGE2slurmCommandError("job list or `-u` is required.")
+
+    converter = AlterMapper("scontrol", dry_run=args.dry_run)
+    fields = converter.convert(args)
+    if not fields and not converter.hold:
+        raise UGE2slurmCommandError("nothing to be altered.")
+
+    # all jobs receive the same update, so they are updated by a few calls
+    # with comma separated job lists
+    user = getpass.getuser()
+    retcode = None
+    if fields:
+        message = "{} modified job {{job}}".format(user)
+        retcode = run_job_control(args, "update", job_list, message, fields)
+    if converter.hold:
+        message = "{} modified hold of job {{job}}".format(user)
+        retcode = run_job_control(args, "uhold", job_list, message) or retcode
+
+    return retcode
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
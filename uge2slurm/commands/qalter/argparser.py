@@ -0,0 +1,32 @@
+import argparse
+
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import set_orig_argsuments, set_qsub_arguments, appendkv
+
+parser_args = dict(
+    description="Mapping UGE qalter command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_orig_argsuments(parser)
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="Number of scontrol commands executed in parallel (default: 4).")
+
+    uge = parser.add_argument_group(
+        title="qalter options",
+        description="UGE qsub options to be altered. The job list is given "
+                    "instead of the job script."
+    )
+    set_qsub_arguments(uge)
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="wc_user_list")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -0,0 +1,106 @@
+import logging
+from collections import OrderedDict
+
+from ..qsub.mapper import CommandMapper
+
+logger = logging.getLogger(__name__)
+
+
+class AlterMapper(CommandMapper):
+    """
+    Map qsub options into `scontrol update` fields by the `CommandMapper`
+    option mappings. `convert` returns a list of `Field=value`.
+    """
+    _logger = logger
+
+    # sbatch options and `scontrol update` fields
+    UPDATE_FIELDS = {
+        "--account": "Account",
+        "--begin": "StartTime",
+        "--chdir": "WorkDir",
+        "--cpus-per-task": "CPUsPerTask",
+        "--deadline": "Deadline",
+        "--dependency": "Dependency",
+        "--error": "StdErr",
+        "--job-name": "Name",
+        "--mail-type": "MailType",
+        "--mail-user": "MailUser",
+        "--mem-per-cpu": "MinMemoryCPU",
+        "--nice": "Nice",
+        "--nodelist": "ReqNodeList",
+        "--nodes": "NumNodes",
+        "--ntasks": "NumTasks",
+        "--output": "StdOut",
+        "--partition": "Partition",
+        "--reservation": "Reservation",
+        "--time": "TimeLimit",
+        "--tmp": "MinTmpDiskNode",
+        "--wckey": "WCKey"
+    }
+    UPDATE_FLAGS = {
+        "--requeue": "Requeue=1",
+        "--no-requeue": "Requeue=0"
+    }
+    # options which take no value
+    _FLAGS = ("--hold", "--parsable", "--test-only", "--spread-job")
+
+    def __init__(self, bin, dry_run=False):
+        super(AlterMapper, self).__init__(bin, dry_run)
+        self.hold = False
+
+    def pre_convert(self):
+        command = self._split_binding(self._args)
+        self._args.command = command + self._args.command
+
+        for d in (self._args.l, self._args.q):
+            self._merge_hard_env(d)
+
+        for dest in ('b', 'S', 'v', 'V', 'binding', 'mbind'):
+            if getattr(self._args, dest) not in (None, False):
+                self._logger.warning("`-{}` cannot be altered. ignored.".format(dest))
+                setattr(self._args, dest, None)
+
+    def post_convert(self):
+        # `-t` selects tasks to be altered and is not mapped here
+        self._map_dependency()
+        if self._args.tc is not None:
+            self.args.append("ArrayTaskThrottle=" + self._args.tc)
+
+        if self._pe_candidates:
+            nslots, layout = self._pe_candidates[0]
+            self._logger.warning("use the minimum number of slots {} for a slot range.".format(nslots))
+            self.args += layout
+
+    def convert(self, namespace):
+        options = super(AlterMapper, self).convert(namespace)[1:]
+        return self._get_fields(options)
+
+    def _get_fields(self, options):
+        fields = OrderedDict()
+        i = 0
+        while i < len(options):
+            option = options[i]
+            if option in self._FLAGS or option in self.UPDATE_FLAGS or not option.startswith("--"):
+                value = None
+                i += 1
+            else:
+                value = options[i + 1]
+                i += 2
+
+            if option == "--hold":
+                self.hold = True
+            elif option in self.UPDATE_FLAGS:
+                key, value = self.UPDATE_FLAGS[option].split('=', 1)
+                fields[key] = value
+            elif option in self.UPDATE_FIELDS:
+                fields[self.UPDATE_FIELDS[option]] = value
+            elif '=' in option:
+                # fields set by `post_convert`
+                key, value = option.split('=', 1)
+                fields[key] = value
+            else:
+                self._logger.warning("`{}` cannot be altered. ignored.".format(
+                    option if value is None else option + ' ' + value
+                ))
+
+        return ["{}={}".format(k, v) for k, v in fields.items()]
@@ -1,10 +1,77 @@
+from __future__ import print_function
+
+import sys
+import getpass
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.log import entrypoint, print_command
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.slurm import run_command
+from uge2slurm.utils.ranges import format_ge_ranges
+from uge2slurm.utils.joblist import resolve_job_list, format_job_id, chunk_arguments
+
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qdel", "scancel")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    job_list = [job for item in args.job_list for job in item.split(',') if job]
+    if not job_list and args.u is None:
+        raise UGE2slurmCommandError("job list or `-u` is required.")
+
+    jobs, missing = resolve_job_list(job_list, args.t, args.u)
+    for item in missing:
+        print('denied: job "{}" does not exist'.format(item), file=sys.stderr)
+
+    ids = [format_job_id(job_id, tasks) for job_id, tasks in jobs.items()]
+    messages = _format_messages(jobs)
+
+    failed = False
+    with ChunkedWriter() as writer:
+        offset = 0
+        for chunk in chunk_arguments(ids):
+            command = ["scancel"] + chunk
+            begin, offset = offset, offset + len(chunk)
+            if args.dry_run:
+                print_command(command)
+                continue
+
+            try:
+                run_command(None, command)
+            except UGE2slurmCommandError as e:
+                logger.error(e)
+                failed = True
+                continue
+            for message in messages[begin:offset]:
+                writer.write(message)
+
+    if missing or failed:
+        return 1
+
+
+def _format_messages(jobs):
+    user = getpass.getuser()
+    messages = []
+    for job_id, tasks in jobs.items():
+        if tasks is None:
+            messages.append("{} has registered the job {} for deletion\n".format(user, job_id))
+        else:
+            messages.append("{} has registered the job-array task {}.{} for deletion\n".format(
+                user, job_id, format_ge_ranges(tasks)
+            ))
+    return messages
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,42 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import singlearg, appendkv
+
+parser_args = dict(
+    description="Mapping UGE qdel command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="Print the scancel commands instead of executing them.")
+
+    uge = parser.add_argument_group(
+        title="qdel options",
+        description="UGE qdel options"
+    )
+    set_qdel_arguments(uge)
+
+
+def set_qdel_arguments(uge):
+    uge.add_argument("-f", action="store_true",
+                     help="Accepted for compatibility. Slurm cancels jobs on "
+                          "unresponsive nodes by itself.")
+    uge.add_argument("-t", nargs=1, action=singlearg, metavar="task_id_range")
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="wc_user_list")
+    uge.add_argument("job_list", nargs='*', metavar="wc_job_list",
+                     help="Job ids, `job_id.task_id_range`, job names or wildcards. "
+                          "Comma separated lists are allowed.")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
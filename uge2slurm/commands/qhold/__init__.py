@@ -1,10 +1,37 @@
+import getpass
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.commands.jobcontrol import get_job_list, run_job_control
+from uge2slurm.utils.log import entrypoint
+
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qhold", "scontrol hold")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    job_list = get_job_list(args.job_list)
+    if not job_list and args.u is None:
+        raise UGE2slurmCommandError("job list or `-u` is required.")
+
+    # Slurm has user holds and administrator holds
+    action = "uhold" if args.h == ['u'] else "hold"
+    if action == "hold" and 'u' in args.h:
+        logger.warning("user and other holds are set as an administrator hold.")
+
+    message = "{} modified hold of job {{job}}".format(getpass.getuser())
+    return run_job_control(args, action, job_list, message)
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
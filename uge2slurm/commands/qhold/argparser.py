@@ -0,0 +1,51 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.commands.jobcontrol import set_common_control_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import singlearg, appendkv
+
+parser_args = dict(
+    description="Mapping UGE qhold command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+HOLD_TYPES = ('u', 'o', 's')
+
+
+def hold_type(value):
+    types = value.split(',')
+    for t in types:
+        if t not in HOLD_TYPES:
+            raise argparse.ArgumentTypeError('unknown hold type: "{}"'.format(t))
+    return types
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    set_common_control_args(parser)
+
+    uge = parser.add_argument_group(
+        title="qhold options",
+        description="UGE qhold options"
+    )
+    set_hold_arguments(uge)
+
+
+def set_hold_arguments(uge):
+    uge.add_argument("-h", type=hold_type, default=['u'], metavar="{u|o|s},...",
+                     help="Hold types (default: u).")
+    uge.add_argument("-t", nargs=1, action=singlearg, metavar="task_id_range")
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="wc_user_list")
+    uge.add_argument("job_list", nargs='*', metavar="wc_job_list",
+                     help="Job ids, `job_id.task_id_range`, job names or wildcards. "
+                          "Comma separated lists are allowed.")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -1,10 +1,65 @@
 import logging
+from fnmatch import fnmatchcase
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.utils.log import entrypoint
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.hostlist import expand_hostlist, compress_hostlist
+
+from .argparser import get_parser, parser_args
+from .formatter import TextFormatter, XMLFormatter
+from .hosts import iter_hosts, set_queue_usage, aggregate
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qhost", "sinfo -N")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    hostlist, patterns = _get_host_filter(args.h)
+    hosts = list(iter_hosts(hostlist))
+    if patterns:
+        hosts = [host for host in hosts if any(fnmatchcase(host.name, p) for p in patterns)]
+
+    if args.q:
+        set_queue_usage(hosts)
+    # the summaries are written before hosts as UGE `global` host
+    total, partitions = aggregate(hosts)
+
+    formatter_class = XMLFormatter if args.xml else TextFormatter
+    with ChunkedWriter() as writer:
+        formatter = formatter_class(writer, show_queues=bool(args.q))
+        formatter.write_global(total, partitions)
+        for host in hosts:
+            formatter.write(host)
+        formatter.close()
+
+
+def _get_host_filter(values):
+    """Return a hostlist expression for `scontrol` and wildcard patterns filtered locally."""
+    if not values:
+        return None, []
+
+    hosts = []
+    patterns = []
+    for value in values:
+        for host in expand_hostlist(value):
+            if any(c in host for c in "*?"):
+                patterns.append(host)
+            else:
+                hosts.append(host)
+
+    if patterns:
+        # wildcards cannot be given to `scontrol`; filter all hosts instead
+        return None, patterns + hosts
+    return compress_hostlist(hosts), []
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
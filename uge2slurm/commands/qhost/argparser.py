@@ -0,0 +1,36 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+parser_args = dict(
+    description="Mapping UGE qhost command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+
+    uge = parser.add_argument_group(
+        title="qhost options",
+        description="UGE qhost options"
+    )
+    set_qhost_arguments(uge)
+
+
+def set_qhost_arguments(uge):
+    uge.add_argument("-h", action="append", metavar="hostlist",
+                     help="Show only the specified hosts. Slurm hostlist "
+                          "expressions and wildcards are allowed.")
+    uge.add_argument("-q", action="store_true", default=None,
+                     help="Show partitions (queues) of each host.")
+    uge.add_argument("-xml", action="store_true", default=None)
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
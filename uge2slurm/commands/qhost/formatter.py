@@ -0,0 +1,121 @@
+from xml.sax.saxutils import escape, quoteattr
+
+_MEMORY_UNITS = (('T', 1024 ** 2), ('G', 1024), ('M', 1))
+
+
+def format_memory(megabytes):
+    """Format megabytes in qhost style like `62.8G`."""
+    if megabytes is None:
+        return '-'
+    for unit, size in _MEMORY_UNITS:
+        if megabytes >= size:
+            return "{:.1f}{}".format(float(megabytes) / size, unit)
+    return "0.0"
+
+
+def _format_value(value, fmt="{}"):
+    return '-' if value is None else fmt.format(value)
+
+
+def _format_load(value):
+    return _format_value(value, "{:.2f}")
+
+
+class TextFormatter(object):
+    HEADER = ("HOSTNAME                ARCH         NCPU NSOC NCOR NTHR  LOAD  "
+              "MEMTOT  MEMUSE  SWAPTO  SWAPUS")
+    ROW = "{:<23.23} {:<12.12} {:>4} {:>4} {:>4} {:>4} {:>5} {:>7} {:>7} {:>7} {:>7}\n"
+    QUEUE_ROW = "   {:<20} {:<5} {}/{}/{}{}\n"
+
+    def __init__(self, writer, show_queues=False):
+        self.writer = writer
+        self.show_queues = show_queues
+        self.writer.write(self.HEADER + '\n' + '-' * len(self.HEADER) + '\n')
+
+    def _write_queue(self, name, used, total, states=''):
+        self.writer.write(self.QUEUE_ROW.format(name, "BIP", 0, used, total, ' ' + states if states else ''))
+
+    def write_global(self, total, partitions):
+        """Write the cluster-wide summary and the summary of each partition as `global`."""
+        self.writer.write(self.ROW.format(
+            "global", '-', total.ncpu, '-', '-', '-', _format_load(total.load),
+            format_memory(total.memtot), format_memory(total.memuse), '-', '-'
+        ))
+        if self.show_queues:
+            for partition in partitions.values():
+                self._write_queue(partition.name, partition.used, partition.ncpu)
+
+    def write(self, host):
+        self.writer.write(self.ROW.format(
+            host.name, host.arch, _format_value(host.ncpu), _format_value(host.nsoc),
+            _format_value(host.ncor), _format_value(host.nthr), _format_load(host.load),
+            format_memory(host.memtot), format_memory(host.memuse), '-', '-'
+        ))
+        if self.show_queues:
+            for partition in host.partitions:
+                self._write_queue(partition, host.queue_used.get(partition, 0), _format_value(host.ncpu),
+                                  host.states)
+
+    def close(self):
+        pass
+
+
+class XMLFormatter(object):
+    HEAD = ("<?xml version='1.0'?>\n"
+            "<qhost xmlns:xsd=\"http://arc.liv.ac.uk/repos/darcs/sge/source/dist/"
+            "util/resources/schemas/qhost/qhost.xsd\">\n")
+    TAIL = "</qhost>\n"
+
+    def __init__(self, writer, show_queues=False):
+        self.writer = writer
+        self.show_queues = show_queues
+        self.writer.write(self.HEAD)
+
+    @staticmethod
+    def _host_values(values):
+        return ''.join(
+            "   <hostvalue name={}>{}</hostvalue>\n".format(quoteattr(name), escape(str(value)))
+            for name, value in values
+        )
+
+    @staticmethod
+    def _queue(name, used, total, states=''):
+        qname = quoteattr(name)
+        values = (("qtype_string", "BIP"), ("slots_used", used), ("slots", total),
+                  ("slots_resv", 0), ("state_string", states))
+        return "   <queue name={}>\n{}   </queue>\n".format(qname, ''.join(
+            "     <queuevalue qname={} name={}>{}</queuevalue>\n".format(qname, quoteattr(k), escape(str(v)))
+            for k, v in values
+        ))
+
+    def _write_host(self, name, values, queues):
+        elements = [" <host name={}>\n".format(quoteattr(name)), self._host_values(values)]
+        if self.show_queues:
+            elements += queues
+        elements.append(" </host>\n")
+        self.writer.write(''.join(elements))
+
+    def write_global(self, total, partitions):
+        values = (
+            ("arch_string", '-'), ("num_proc", total.ncpu), ("m_socket", '-'),
+            ("m_core", '-'), ("m_thread", '-'), ("np_load_avg", _format_load(total.np_load)),
+            ("mem_total", format_memory(total.memtot)), ("mem_used", format_memory(total.memuse)),
+            ("swap_total", '-'), ("swap_used", '-')
+        )
+        queues = [self._queue(p.name, p.used, p.ncpu) for p in partitions.values()]
+        self._write_host("global", values, queues)
+
+    def write(self, host):
+        values = (
+            ("arch_string", host.arch), ("num_proc", _format_value(host.ncpu)),
+            ("m_socket", _format_value(host.nsoc)), ("m_core", _format_value(host.ncor)),
+            ("m_thread", _format_value(host.nthr)), ("np_load_avg", _format_load(host.np_load)),
+            ("mem_total", format_memory(host.memtot)), ("mem_used", format_memory(host.memuse)),
+            ("swap_total", '-'), ("swap_used", '-')
+        )
+        queues = [self._queue(p, host.queue_used.get(p, 0), _format_value(host.ncpu), host.states)
+                  for p in host.partitions]
+        self._write_host(host.name, values, queues)
+
+    def close(self):
+        self.writer.write(self.TAIL)
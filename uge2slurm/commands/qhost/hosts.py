@@ -0,0 +1,158 @@
+from collections import OrderedDict, defaultdict
+
+from uge2slurm.utils.scontrol import iter_show
+from uge2slurm.utils.squeue import iter_jobs
+from uge2slurm.utils.hostlist import expand_hostlist, compress_hostlist
+
+# Slurm node state flags and UGE queue state letters
+_STATE_MAPPER = (
+    ("DOWN", 'u'),
+    ("NOT_RESPONDING", 'u'),
+    ("DRAIN", 'd'),
+    ("FAIL", 'E'),
+    ("MAINT", 'd'),
+    ("RESERVED", 'd')
+)
+_ARCH_MAPPER = {
+    "x86_64": "lx-amd64",
+    "aarch64": "lx-arm64",
+    "ppc64le": "lx-ppc64le"
+}
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_states(state):
+    """Convert `State` like `IDLE+DRAIN` into UGE queue states like `d`."""
+    states = ''
+    for flag, letter in _STATE_MAPPER:
+        if flag in state and letter not in states:
+            states += letter
+    return states
+
+
+class Host(object):
+    __slots__ = ("name", "arch", "ncpu", "nsoc", "ncor", "nthr", "load",
+                 "memtot", "memuse", "used", "partitions", "queue_used", "states")
+
+    def __init__(self, record):
+        self.name = record.get("NodeName", '')
+        arch = record.get("Arch")
+        self.arch = _ARCH_MAPPER.get(arch, arch or '-')
+        self.ncpu = _to_int(record.get("CPUTot"))
+        sockets = _to_int(record.get("Sockets"))
+        boards = _to_int(record.get("Boards")) or 1
+        cores = _to_int(record.get("CoresPerSocket"))
+        threads = _to_int(record.get("ThreadsPerCore"))
+        self.nsoc = None if sockets is None else sockets * boards
+        self.ncor = None if self.nsoc is None or cores is None else self.nsoc * cores
+        self.nthr = None if self.ncor is None or threads is None else self.ncor * threads
+        self.load = _to_float(record.get("CPULoad"))
+
+        # memory in megabytes
+        self.memtot = _to_int(record.get("RealMemory"))
+        free = _to_int(record.get("FreeMem"))
+        self.memuse = None if self.memtot is None or free is None else max(self.memtot - free, 0)
+
+        self.used = _to_int(record.get("CPUAlloc")) or 0
+        partitions = record.get("Partitions")
+        self.partitions = partitions.split(',') if partitions and partitions != "(null)" else []
+        # CPUs used by jobs of each partition, which are set by `set_queue_usage`
+        self.queue_used = {}
+        self.states = get_states(record.get("State", ''))
+
+    @property
+    def np_load(self):
+        """The load divided by the number of CPUs."""
+        if self.load is not None and self.ncpu:
+            return self.load / self.ncpu
+
+
+class Summary(object):
+    """Aggregated values of hosts."""
+    def __init__(self, name):
+        self.name = name
+        self.hosts = 0
+        self.ncpu = 0
+        self.used = 0
+        self.memtot = 0
+        self.memuse = 0
+        self._load = 0.
+        self._loaded = 0
+        self._np_load = 0.
+        self._np_ncpu = 0
+
+    def add(self, host, used=None):
+        self.hosts += 1
+        self.ncpu += host.ncpu or 0
+        self.used += host.used if used is None else used
+        self.memtot += host.memtot or 0
+        self.memuse += host.memuse or 0
+        if host.load is not None:
+            self._load += host.load
+            self._loaded += 1
+            if host.ncpu:
+                self._np_load += host.load
+                self._np_ncpu += host.ncpu
+
+    @property
+    def load(self):
+        if self._loaded:
+            return self._load / self._loaded
+
+    @property
+    def np_load(self):
+        if self._np_ncpu:
+            return self._np_load / self._np_ncpu
+
+
+def iter_hosts(hostlist=None):
+    """Yield hosts from a single `scontrol show node` call."""
+    args = [] if hostlist is None else [hostlist]
+    for record in iter_show("node", args):
+        yield Host(record)
+
+
+def set_queue_usage(hosts):
+    """
+    Set CPUs used by running jobs of each partition to hosts by a single
+    `squeue` call. CPUs of a job over multiple hosts are divided evenly.
+    """
+    hosts = OrderedDict((host.name, host) for host in hosts)
+    if not hosts:
+        return
+
+    usage = defaultdict(int)
+    for job in iter_jobs(["--all", "--states", "RUNNING", "--nodelist", compress_hostlist(hosts)]):
+        cpus = int(job.cpus) if job.cpus.isdigit() else 0
+        names = expand_hostlist(job.nodelist) if job.nodelist else []
+        for i, name in enumerate(names):
+            usage[(name, job.partition)] += cpus // len(names) + (i < cpus % len(names))
+
+    for host in hosts.values():
+        host.queue_used = dict((p, usage[(host.name, p)]) for p in host.partitions)
+
+
+def aggregate(hosts):
+    """Return the cluster-wide summary and an OrderedDict of partition summaries."""
+    total = Summary("global")
+    partitions = OrderedDict()
+    for host in hosts:
+        total.add(host)
+        for partition in host.partitions:
+            if partition not in partitions:
+                partitions[partition] = Summary(partition)
+            partitions[partition].add(host, host.queue_used.get(partition, 0))
+    return total, partitions
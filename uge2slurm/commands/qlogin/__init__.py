@@ -1,10 +1,31 @@
+import argparse
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.utils.log import entrypoint
+from uge2slurm.commands import UGE2slurmCommandError
+
+from .. import qrsh
+from ..qrsh.argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
+parser_args = dict(parser_args, description="Mapping UGE qlogin command to slurm")
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qlogin", "srun --pty")
+    parser = get_parser(argparse.ArgumentParser(**parser_args), name="qlogin")
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    if args.command:
+        raise UGE2slurmCommandError("qlogin does not take a command. Use qrsh instead.")
+    return qrsh.run(args)
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser, name="qlogin")
+    parser.set_defaults(func=run)
@@ -1,10 +1,176 @@
+import os
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.utils.path import get_command_path
+from uge2slurm.utils.log import entrypoint, print_command
+from uge2slurm.utils.py2.shlex import quote
+from uge2slurm.commands import UGE2slurmCommandError, WRAPPER_DIR
+
+from .argparser import get_parser, parser_args
+from ..qrsh.mapper import LoginMapper
 
 logger = logging.getLogger(__name__)
 
+MAKEFILE_PATH = os.path.join(WRAPPER_DIR, "uge2slurm-qmake.mk")
+# each recipe is a single task step which waits for free CPUs of the allocation
+_STEP_OPTIONS = ["--exact", "--nodes", "1", "--ntasks", "1", "--quiet"]
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qmake")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+# GNU make short options without values and with required or optional values
+_MAKE_FLAGS = "bBdeEhiknpqrRsStvw"
+_MAKE_OPTIONS = "CfIoW"
+_MAKE_OPTIONAL = "jlO"
+_DEFAULT_MAKEFILES = ("GNUmakefile", "makefile", "Makefile")
+
+
+def parse_make_args(make_args):
+    """
+    Scan GNU make options for `-j`, `-f` and `-C`. Return the number of jobs
+    (0 for unlimited and None if not given), makefiles and directories.
+    """
+    jobs = None
+    makefiles = []
+    directories = []
+
+    def _set(name, value):
+        if name in ('j', "jobs"):
+            return int(value) if value.isdigit() else 0
+        if name in ('f', "file", "makefile"):
+            makefiles.append(value)
+        elif name in ('C', "directory"):
+            directories.append(value)
+        return jobs
+
+    i = 0
+    while i < len(make_args):
+        arg = make_args[i]
+        i += 1
+        if arg == "--":
+            break
+        elif arg.startswith("--"):
+            name, eq, value = arg[2:].partition('=')
+            if name in ("file", "makefile", "directory") and not eq and i < len(make_args):
+                value = make_args[i]
+                i += 1
+            elif name == "jobs" and not eq and i < len(make_args) and make_args[i].isdigit():
+                value = make_args[i]
+                i += 1
+            jobs = _set(name, value)
+        elif arg.startswith('-') and len(arg) > 1:
+            for k, flag in enumerate(arg[1:], 2):
+                if flag in _MAKE_FLAGS:
+                    continue
+                value = arg[k:]
+                if flag in _MAKE_OPTIONS and not value and i < len(make_args):
+                    value = make_args[i]
+                    i += 1
+                elif flag == 'j' and not value and i < len(make_args) and make_args[i].isdigit():
+                    value = make_args[i]
+                    i += 1
+                if flag in _MAKE_OPTIONS or flag in _MAKE_OPTIONAL:
+                    jobs = _set(flag, value)
+                break
+    return jobs, makefiles, directories
+
+
+def get_make_jobs(make_args):
+    """Return the number of make jobs by `-j`. 0 for unlimited and None if not given."""
+    return parse_make_args(make_args)[0]
+
+
+def get_makefile_args(make_args):
+    """
+    Return `-f` options to read `uge2slurm-qmake.mk` after the makefiles, which
+    are the default makefile if no `-f` is given.
+    """
+    _, makefiles, directories = parse_make_args(make_args)
+    args = []
+    if not makefiles:
+        directory = os.path.join(*directories) if directories else os.curdir
+        for name in _DEFAULT_MAKEFILES:
+            if os.path.exists(os.path.join(directory, name)):
+                args += ["-f", name]
+                break
+    return args + ["-f", MAKEFILE_PATH]
+
+
+def _get_cpus_option(cpus):
+    # steps do not inherit `--cpus-per-task` of the allocation since Slurm 22.05
+    return ["--cpus-per-task", cpus] if cpus else []
+
+
+def _get_binary(command_name, dry_run):
+    binary = get_command_path(command_name)
+    if not binary:
+        message = "command not found: " + command_name
+        if not dry_run:
+            raise UGE2slurmCommandError(message)
+        logger.error(message)
+        logger.warning("Continue dry run anyway.")
+        binary = command_name
+    return binary
+
+
+def run(args):
+    make_args = args.command
+    if make_args and make_args[0] == "--":
+        make_args = make_args[1:]
+    jobs = get_make_jobs(make_args)
+
+    # make options are not a command of the session
+    args.command = []
+    args.pty = False
+
+    srun = _get_binary("srun", args.dry_run)
+    # the makefiles keep their SHELL and `uge2slurm-qmake.mk` replaces it for recipes
+    makefile_args = get_makefile_args(make_args)
+    if "--" in make_args:
+        i = make_args.index("--")
+        make_args = make_args[:i] + makefile_args + make_args[i:]
+    else:
+        make_args = make_args + makefile_args
+    make = [_get_binary("make", args.dry_run)] + make_args
+
+    if args.inherit:
+        if "SLURM_JOB_ID" not in os.environ:
+            raise UGE2slurmCommandError("`-inherit` requires to run qmake in a Slurm job.")
+        step = [srun] + _STEP_OPTIONS + _get_cpus_option(os.environ.get("SLURM_CPUS_PER_TASK"))
+        command = make
+    elif args.dynamic:
+        # each recipe requests its own resources
+        options = LoginMapper("srun", dry_run=args.dry_run).convert(args)
+        step = [srun] + options[1:] + _STEP_OPTIONS[1:]
+        command = make
+    else:
+        if jobs == 0:
+            raise UGE2slurmCommandError("specify the number of make jobs by `-j N` to allocate CPUs.")
+        command = LoginMapper("salloc", dry_run=args.dry_run).convert(args)
+        if "--ntasks" not in command:
+            command += ["--ntasks", str(jobs or 1)]
+        command[0] = _get_binary("salloc", args.dry_run)
+        cpus = command[command.index("--cpus-per-task") + 1] if "--cpus-per-task" in command else None
+        command += make
+        step = [srun] + _STEP_OPTIONS + _get_cpus_option(cpus)
+
+    step_command = ' '.join(quote(arg) for arg in step)
+    if args.dry_run:
+        logger.debug(args)
+        print_command(command)
+        logger.info("recipes are run by: " + step_command)
+        return
+
+    os.environ["UGE2SLURM_QMAKE_SRUN"] = step_command
+    os.execv(command[0], command)
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
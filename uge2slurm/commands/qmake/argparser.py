@@ -0,0 +1,36 @@
+import argparse
+
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import set_orig_argsuments, set_qsub_arguments
+
+parser_args = dict(
+    description="Mapping UGE qmake command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_orig_argsuments(parser)
+    parser.add_argument(
+        "--dynamic", action="store_true",
+        help="Run each recipe as a job by srun instead of a job step in an "
+             "allocation of `-j` CPUs. make runs on the current host."
+    )
+
+    uge = parser.add_argument_group(
+        title="qmake options",
+        description="UGE qsub options for the allocation followed by `--` and "
+                    "make options"
+    )
+    uge.add_argument("-inherit", action="store_true",
+                     help="Run recipes as job steps of the current Slurm job.")
+    set_qsub_arguments(uge)
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -1,10 +1,44 @@
+import getpass
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.commands.jobcontrol import get_job_list, run_job_control
+from uge2slurm.utils.log import entrypoint
+
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
+_OPERATIONS = (
+    ("suspend", "suspend", "suspended"),
+    ("resume", "resume", "unsuspended")
+)
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qmod")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    if args.suspend is None and args.resume is None:
+        raise UGE2slurmCommandError("only `-s` and `-us` are supported.")
+
+    user = getpass.getuser()
+    retcode = None
+    for dest, action, verb in _OPERATIONS:
+        values = getattr(args, dest)
+        if values is None:
+            continue
+        message = "{} - {} job {{job}}".format(user, verb)
+        retcode = run_job_control(args, action, get_job_list(values), message) or retcode
+
+    return retcode
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,41 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.commands.jobcontrol import set_common_control_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import appendkv
+
+parser_args = dict(
+    description="Mapping UGE qmod command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    set_common_control_args(parser)
+
+    uge = parser.add_argument_group(
+        title="qmod options",
+        description="UGE qmod options (only job operations are supported)"
+    )
+    set_qmod_arguments(uge)
+
+
+def set_qmod_arguments(uge):
+    uge.add_argument("-f", action="store_true",
+                     help="Accepted for compatibility.")
+    uge.add_argument("-s", "-sj", nargs=1, action=appendkv, dest="suspend",
+                     metavar="wc_job_list", help="Suspend jobs.")
+    uge.add_argument("-us", "-usj", nargs=1, action=appendkv, dest="resume",
+                     metavar="wc_job_list", help="Unsuspend jobs.")
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="wc_user_list")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -1,10 +1,159 @@
+from __future__ import print_function
+
+import os
+import re
+import sys
+import hashlib
 import logging
+from subprocess import PIPE
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.commands.jobcontrol import get_job_list
+from uge2slurm.utils.log import entrypoint, print_command
+from uge2slurm.utils.path import get_command_path
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.py2.subprocess import run as run_process
+from uge2slurm.utils.ranges import parse_task_ranges
+from uge2slurm.utils.joblist import format_task_ranges
+from uge2slurm.utils.submitlog import find_submissions, get_spool_path, read_spool, record_submission
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qresub", "scontrol")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    requests = OrderedDict()
+    for item in get_job_list(args.job_task_list):
+        job_id, _, task_range = item.partition('.')
+        if not job_id.isdigit():
+            raise UGE2slurmCommandError('invalid job id "{}".'.format(item))
+        requests[job_id] = parse_task_ranges(task_range) if task_range else None
+
+    # submissions are restored from the local log without asking the controller
+    records = find_submissions(requests)
+    retcode = None
+    submissions = []
+    for job_id, tasks in requests.items():
+        if job_id not in records:
+            print('denied: no submission record of job "{}" found'.format(job_id), file=sys.stderr)
+            retcode = 1
+            continue
+
+        record = records[job_id]
+        _check_script(record)
+        argv = _make_argv(record, tasks, args.h)
+        # `sbatch` reads the exported variables from the spool
+        env_path = get_spool_path(record.env_hash) if record.env_hash else None
+        try:
+            stdin = read_spool(record.stdin_hash) if record.stdin_hash else None
+            found = env_path is None or os.path.exists(env_path)
+        except (IOError, OSError):
+            found = False
+        if not found:
+            logger.error("job {}: the job script or the environment is not found in the spool.".format(job_id))
+            retcode = 1
+            continue
+        if env_path:
+            argv[argv.index("--export-file") + 1] = env_path
+        submissions.append((record, argv, stdin))
+
+    if args.dry_run:
+        for _, argv, _ in submissions:
+            print_command(argv)
+        return retcode
+
+    if not submissions:
+        return retcode
+
+    binary = get_command_path("sbatch")
+    if not binary:
+        raise UGE2slurmCommandError("Command `sbatch` not found.")
+
+    pool = ThreadPool(max(1, min(args.workers, len(submissions))))
+    try:
+        results = pool.imap(_submit, [(binary, record, argv, stdin) for record, argv, stdin in submissions])
+        with ChunkedWriter() as writer:
+            for (record, argv, stdin), (new_id, message) in zip(submissions, results):
+                if new_id is None:
+                    logger.error("job {}: {}".format(record.jobid, message))
+                    retcode = 1
+                    continue
+
+                writer.write('Your job {} ("{}") has been submitted\n'.format(new_id, _get_job_name(argv)))
+                logger.info("job {} is resubmitted as job {}.".format(record.jobid, new_id))
+                try:
+                    record_submission(new_id, argv, record.script_hash, record.script_path, stdin, record.cwd)
+                except (IOError, OSError) as e:
+                    logger.warning("failed to record the submission: {}".format(e))
+    finally:
+        pool.terminate()
+
+    return retcode
+
+
+def _check_script(record):
+    if record.script_path is None or record.script_hash is None:
+        return
+    try:
+        with open(record.script_path) as f:
+            script = f.read()
+    except (IOError, OSError):
+        logger.warning('job {}: the job script "{}" is not found.'.format(record.jobid, record.script_path))
+        return
+    script = script if isinstance(script, bytes) else script.encode("utf-8")
+    if hashlib.sha1(script).hexdigest() != record.script_hash:
+        logger.warning('job {}: the job script "{}" has been changed since the submission.'.format(
+            record.jobid, record.script_path))
+
+
+def _make_argv(record, tasks, hold):
+    argv = list(record.argv)
+    if tasks is not None:
+        if "--array" in argv:
+            i = argv.index("--array") + 1
+            _, throttle, limit = argv[i].partition('%')
+            argv[i] = format_task_ranges(tasks) + throttle + limit
+        else:
+            logger.warning("job {} is not an array job. task ids are ignored.".format(record.jobid))
+    # options are inserted before the job script
+    if hold and "--hold" not in argv:
+        argv.insert(1, "--hold")
+    return argv
+
+
+def _get_job_name(argv):
+    if "--job-name" in argv:
+        return argv[argv.index("--job-name") + 1]
+    return ''
+
+
+def _submit(submission):
+    binary, record, argv, stdin = submission
+    try:
+        res = run_process([binary] + argv[1:], input=stdin, stdout=PIPE, stderr=PIPE,
+                          universal_newlines=True, cwd=record.cwd)
+    except OSError as e:
+        return None, str(e)
+    if res.returncode:
+        return None, (res.stderr or '').strip() or "sbatch exited with {}".format(res.returncode)
+
+    new_id = re.search(r"\d+", res.stdout or '')
+    if not new_id:
+        return None, "unexpected sbatch output: {}".format(res.stdout.strip())
+    return new_id.group(), None
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,41 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qhold.argparser import hold_type
+
+parser_args = dict(
+    description="Mapping UGE qresub command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="Print the sbatch commands instead of executing them.")
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="Number of sbatch commands executed in parallel (default: 4).")
+
+    uge = parser.add_argument_group(
+        title="qresub options",
+        description="UGE qresub options"
+    )
+    set_qresub_arguments(uge)
+
+
+def set_qresub_arguments(uge):
+    uge.add_argument("-h", type=hold_type, metavar="{u|o|s},...",
+                     help="Submit the copies in the hold state.")
+    uge.add_argument("job_task_list", nargs='+', metavar="job_task_list",
+                     help="Job ids or `job_id.task_id_range` submitted by qsub. "
+                          "Comma separated lists are allowed.")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
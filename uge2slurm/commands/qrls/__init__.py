@@ -1,10 +1,36 @@
+import getpass
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.commands.jobcontrol import get_job_list, run_job_control
+from uge2slurm.utils.log import entrypoint
+
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qrls", "scontrol release")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    job_list = get_job_list(args.job_list)
+    if not job_list and args.u is None:
+        raise UGE2slurmCommandError("job list or `-u` is required.")
+
+    # `scontrol release` releases both user and administrator holds
+    if args.h != ['u']:
+        logger.info("all hold types are released.")
+
+    message = "{} modified hold of job {{job}}".format(getpass.getuser())
+    return run_job_control(args, "release", job_list, message)
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,31 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.commands.jobcontrol import set_common_control_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qhold.argparser import set_hold_arguments
+
+parser_args = dict(
+    description="Mapping UGE qrls command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    set_common_control_args(parser)
+
+    uge = parser.add_argument_group(
+        title="qrls options",
+        description="UGE qrls options"
+    )
+    set_hold_arguments(uge)
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
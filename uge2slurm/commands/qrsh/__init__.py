@@ -1,10 +1,91 @@
+import os
 import logging
+from subprocess import Popen
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.utils.path import get_command_path
+from uge2slurm.utils.log import entrypoint, print_command
+from uge2slurm.commands import UGE2slurmCommandError
+
+from .argparser import get_parser, parser_args
+from .mapper import LoginMapper
+from .pool import SessionPool
 
 logger = logging.getLogger(__name__)
 
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qrsh")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    command_name = "srun"
+
+    binary = get_command_path(command_name)
+    if not binary:
+        message = "command not found: " + command_name
+        if not args.dry_run:
+            raise UGE2slurmCommandError(message)
+        else:
+            logger.error(message)
+            logger.warning("Continue dry run anyway.")
+            binary = command_name
+
+    converter = LoginMapper(command_name, dry_run=args.dry_run)
+    command = converter.convert(args)
+    session = args.command or [os.environ.get("SHELL", "/bin/sh"), "-l"]
+
+    if args.dry_run:
+        logger.debug(args)
+        print_command(command + session)
+        if args.pool > 0:
+            logger.info("the session attaches to a pooled allocation if available.")
+        return
+
+    if args.pool <= 0:
+        os.execv(binary, command + session)
+
+    pool = SessionPool(command[1:], args.pool, args.pool_idle * 60)
+    try:
+        job_id = pool.claim()
+    except UGE2slurmCommandError as e:
+        logger.warning("failed to look up the allocation pool: {}".format(e))
+        job_id = None
+    if job_id is not None:
+        attach = [command_name, "--jobid", job_id, "--overlap"]
+        if "--pty" in command:
+            attach.append("--pty")
+        command = attach
+
+    # the pool is refilled after the session starts so that it does not wait
+    # for the submissions
+    process = Popen([binary] + command[1:] + session)
+    try:
+        try:
+            pool.refill()
+        except (UGE2slurmCommandError, OSError, IOError) as e:
+            logger.warning("failed to refill the allocation pool: {}".format(e))
+        return _wait(process)
+    finally:
+        if job_id is not None:
+            try:
+                pool.release(job_id)
+            except (UGE2slurmCommandError, OSError, IOError) as e:
+                logger.warning("failed to release the pooled allocation {}: {}".format(job_id, e))
+
+
+def _wait(process):
+    while True:
+        try:
+            return process.wait()
+        except KeyboardInterrupt:
+            # SIGINT is also delivered to `srun`, which forwards it to the session
+            continue
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,43 @@
+import argparse
+
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import set_orig_argsuments, set_qsub_arguments
+
+parser_args = dict(
+    description="Mapping UGE qrsh command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser, name="qrsh"):
+    set_orig_argsuments(parser)
+    set_pool_arguments(parser)
+
+    uge = parser.add_argument_group(
+        title="{} options".format(name),
+        description="UGE {} options".format(name)
+    )
+    set_qsub_arguments(uge)
+
+
+def set_pool_arguments(parser):
+    parser.add_argument(
+        "--pool", type=int, default=0, metavar="N",
+        help="Keep N idle allocations per set of resource requests and attach "
+             "sessions to them instead of waiting for a new allocation. The pool "
+             "is refilled while the session runs. Default is 0 (no pool)."
+    )
+    parser.add_argument(
+        "--pool-idle", type=int, default=10, metavar="minutes",
+        help="Release pooled allocations which are not used within this time "
+             "(default: 10)."
+    )
+
+
+def get_parser(parser=None, name="qrsh"):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser, name)
+    return parser
@@ -0,0 +1,58 @@
+import logging
+
+from uge2slurm.mapper import not_supported
+
+from ..qsub.mapper import CommandMapper
+
+logger = logging.getLogger(__name__)
+
+
+class LoginMapper(CommandMapper):
+    """
+    Map qrsh/qlogin options into `srun` options by the `CommandMapper` option
+    mappings. `convert` returns `srun` and its options without the command.
+    """
+    _logger = logger
+
+    # outputs of interactive sessions are not redirected
+    e = not_supported("-e")
+    i = not_supported("-i")
+    o = not_supported("-o")
+    r = not_supported("-r")
+    terse = not_supported("-terse")
+
+    def now(self, value):
+        if value is True:
+            return ["--immediate"]
+
+    def pty(self, value):
+        # `--pty` is decided with the command at `post_convert`
+        pass
+
+    def pre_convert(self):
+        command = self._split_binding(self._args)
+        self._args.command = command + self._args.command
+
+        # the session runs as a job step
+        self._args.srun = True
+
+        for d in (self._args.l, self._args.q):
+            self._merge_hard_env(d)
+
+        if self._args.v is not None or self._args.V:
+            self._logger.info("`srun` passes the current environment to the session.")
+            self._args.v = self._args.V = None
+
+    def post_convert(self):
+        self._map_dependency()
+        self._map_binding()
+        self._map_distribution()
+
+        if self._pe_candidates:
+            nslots, layout = self._pe_candidates[0]
+            self._logger.warning("use the minimum number of slots {} for a slot range.".format(nslots))
+            self.args += layout
+
+        # qlogin and qrsh without a command start a login shell on a terminal
+        if self._args.pty is True or (self._args.pty is None and not self._args.command):
+            self.args.append("--pty")
@@ -0,0 +1,158 @@
+import os
+import uuid
+import hashlib
+import logging
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.path import DATA_DIR
+from uge2slurm.utils.slurm import run_command
+from uge2slurm.utils.units import parse_duration, format_duration
+
+logger = logging.getLogger(__name__)
+
+POOL_DIR = "pool"
+POOL_JOB_NAME = "uge2slurm-pool"
+_CLAIMED = ".claimed"
+# srun options which are not a part of the allocation
+_SESSION_OPTIONS = ("--pty", "--immediate")
+_SESSION_OPTIONS_WITH_VALUE = ("--job-name", )
+
+# the batch script keeps the allocation until it is claimed or the idle timeout
+# and then until the claim is removed. the claim file is the token file renamed
+# by `SessionPool.claim`.
+_POOL_SCRIPT = """#!/bin/sh
+f="{path}"
+start=$(date +%s)
+while [ -e "$f" ] && [ $(( $(date +%s) - start )) -lt {idle} ]; do sleep {poll}; done
+rm -f "$f"
+while [ -e "$f{claimed}" ]; do sleep {poll}; done
+"""
+
+
+def get_allocation_options(options):
+    """Remove session options from `srun` options to get options of the allocation."""
+    allocation = []
+    skip = False
+    for option in options:
+        if skip:
+            skip = False
+        elif option in _SESSION_OPTIONS_WITH_VALUE:
+            skip = True
+        elif option not in _SESSION_OPTIONS:
+            allocation.append(option)
+    return allocation
+
+
+class SessionPool(object):
+    """
+    Per-user pool of idle allocations for interactive sessions. Allocations are
+    grouped by their options and each one is tracked by a token file under
+    `~/.uge2slurm/pool/<options hash>/` which contains the job id.
+    """
+    def __init__(self, options, size, idle, poll=5):
+        self.options = get_allocation_options(options)
+        self.size = size
+        self.idle = idle
+        self.poll = poll
+        key = hashlib.sha1(' '.join(self.options).encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(DATA_DIR, POOL_DIR, key)
+        self._states = None
+
+    def _get_states(self):
+        """Return a dict of job ids and states of pool jobs by a single `squeue` call."""
+        if self._states is None:
+            res = run_command("squeue", ["--me", "--noheader", "--name", POOL_JOB_NAME,
+                                         "--format", "%i %t"])
+            self._states = dict(line.split(' ', 1) for line in res.stdout.splitlines() if ' ' in line)
+        return self._states
+
+    def _iter_tokens(self):
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name.endswith(_CLAIMED):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                with open(path) as f:
+                    job_id = f.read().strip()
+            except (IOError, OSError):
+                continue
+            # the job id is written after the submission
+            if job_id:
+                yield path, job_id
+
+    def claim(self):
+        """Take a running allocation and return its job id. None if no allocation is ready."""
+        tokens = list(self._iter_tokens())
+        if not tokens:
+            return None
+        states = self._get_states()
+        for path, job_id in tokens:
+            if states.get(job_id) != 'R':
+                continue
+            try:
+                os.rename(path, path + _CLAIMED)
+            except OSError:
+                # taken by another session or expired
+                continue
+            logger.info("attach to the pooled allocation {}.".format(job_id))
+            return job_id
+        return None
+
+    def release(self, job_id):
+        """Remove the claim of the allocation and cancel it even if the claim is not found."""
+        try:
+            for name in os.listdir(self.path):
+                if name.endswith(_CLAIMED):
+                    path = os.path.join(self.path, name)
+                    with open(path) as f:
+                        if f.read().strip() == job_id:
+                            os.remove(path)
+        finally:
+            run_command("scancel", [job_id])
+
+    def refill(self):
+        """Remove tokens of finished allocations and submit new ones up to the pool size."""
+        states = self._get_states()
+        count = 0
+        for path, job_id in self._iter_tokens():
+            if job_id in states:
+                count += 1
+            else:
+                os.remove(path)
+
+        if count < self.size and not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        for _ in range(self.size - count):
+            self._submit()
+
+    def _get_time_limit(self):
+        if "--time" not in self.options:
+            return []
+        limit = parse_duration(self.options[self.options.index("--time") + 1])
+        if limit is None:
+            return []
+        # the session starts after waiting in the pool at most `idle` seconds
+        return ["--time", format_duration(limit + self.idle)]
+
+    def _submit(self):
+        path = os.path.join(self.path, uuid.uuid4().hex)
+        open(path, 'w').close()
+
+        script = _POOL_SCRIPT.format(path=path, idle=self.idle, poll=self.poll, claimed=_CLAIMED)
+        options = self.options[:]
+        if "--time" in options:
+            del options[options.index("--time"):options.index("--time") + 2]
+        args = ["--parsable", "--job-name", POOL_JOB_NAME, "--output", "/dev/null"]
+        args += options + self._get_time_limit()
+
+        try:
+            res = run_command("sbatch", args, input=script)
+        except UGE2slurmCommandError:
+            os.remove(path)
+            raise
+        job_id = res.stdout.strip().split(';', 1)[0]
+        with open(path, 'w') as f:
+            f.write(job_id)
+        logger.info("submitted a pooled allocation {}.".format(job_id))
@@ -1,10 +1,153 @@
 import logging
+from fnmatch import fnmatchcase
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.log import entrypoint
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.hostlist import expand_hostlist
+from uge2slurm.utils.joblist import get_user_args
+from uge2slurm.utils.squeue import iter_jobs
+from uge2slurm.utils.units import parse_duration, parse_ge_duration, parse_memory
+
+from ..qsub.petable import parse_slot_ranges
+from ..qstat.formatter import get_state, is_pending, is_held
+from .argparser import get_parser, parser_args
 
 logger = logging.getLogger(__name__)
 
+_STATE_PREDICATES = dict(
+    p=lambda state, job: is_pending(job),
+    r=lambda state, job: state in ('r', 't', "dr"),
+    s=lambda state, job: state in ('s', 'S', 'T'),
+    h=lambda state, job: is_held(job)
+)
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qselect")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    predicates = compile_predicates(args)
+
+    # users are given to `squeue` and the others are filtered here
+    squeue_args = get_user_args(args.u)
+
+    seen = set()
+    with ChunkedWriter() as writer:
+        for job in iter_jobs(squeue_args):
+            if job.array_job_id in seen:
+                continue
+            if all(predicate(job) for predicate in predicates):
+                seen.add(job.array_job_id)
+                writer.write(job.array_job_id + '\n')
+
+
+def compile_predicates(args):
+    """Build the filters once so that each job is only tested against them."""
+    predicates = []
+    if args.q is not None:
+        predicates.append(_queue_predicate(args.q))
+    if args.s is not None:
+        predicates.append(_state_predicate(args.s))
+    if args.l is not None:
+        predicates += _resource_predicates(args.l, args.runtime, args.memory)
+    if args.pe is not None:
+        predicates.append(_pe_predicate(*args.pe))
+    return predicates
+
+
+def _match_partition(job, patterns):
+    # pending jobs may be submitted to multiple partitions
+    return any(fnmatchcase(partition, pattern)
+               for partition in job.partition.split(',') for pattern in patterns)
+
+
+def _queue_predicate(queues):
+    queue_patterns = []
+    for queue in queues:
+        partition, _, host = queue.partition('@')
+        queue_patterns.append((partition or '*', host or None))
+
+    def _predicate(job):
+        for partition, host in queue_patterns:
+            if not _match_partition(job, (partition, )):
+                continue
+            if host is None:
+                return True
+            if not is_pending(job) and any(fnmatchcase(h, host) for h in expand_hostlist(job.nodelist)):
+                return True
+        return False
+    return _predicate
+
+
+def _state_predicate(states):
+    predicates = []
+    for state in states:
+        if state not in _STATE_PREDICATES:
+            raise UGE2slurmCommandError('unknown job state "{}" for "-s".'.format(state))
+        predicates.append(_STATE_PREDICATES[state])
+
+    def _predicate(job):
+        state = get_state(job)
+        return any(predicate(state, job) for predicate in predicates)
+    return _predicate
+
+
+def _limit_predicate(field, parser, limit):
+    def _predicate(job):
+        value = parser(getattr(job, field))
+        # unlimited requests fit only into an unlimited resource
+        if value is None:
+            return limit is None
+        return limit is None or value <= limit
+    return _predicate
+
+
+def _resource_predicates(resources, runtime, memory):
+    predicates = []
+    partitions = []
+    for kv in resources:
+        name, _, value = kv.partition('=')
+        if name in runtime:
+            try:
+                limit = parse_ge_duration(value)
+            except ValueError:
+                raise UGE2slurmCommandError('invalid time value "{}".'.format(kv))
+            predicates.append(_limit_predicate("time_limit", parse_duration, limit))
+        elif name in memory:
+            limit = parse_memory(value)
+            if limit is None:
+                raise UGE2slurmCommandError('invalid memory value "{}".'.format(kv))
+            predicates.append(_limit_predicate("min_memory", parse_memory, limit))
+        else:
+            partitions.append(name)
+
+    if partitions:
+        predicates.append(lambda job: _match_partition(job, partitions))
+    return predicates
+
+
+def _pe_predicate(pe_name, slots):
+    logger.warning('Slurm does not keep parallel environment names. "{}" is ignored and '
+                   'only the number of CPUs is compared.'.format(pe_name))
+    if slots is None:
+        return lambda job: True
+    ranges = parse_slot_ranges(slots)
+
+    def _predicate(job):
+        try:
+            cpus = int(job.cpus)
+        except ValueError:
+            return False
+        return any(lower <= cpus and (upper is None or cpus <= upper) for lower, upper in ranges)
+    return _predicate
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,53 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import singlearg, appendkv
+
+parser_args = dict(
+    description="Select jobs by UGE qselect options and print their ids",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+class _appendpe(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string):
+        setattr(namespace, self.dest, (values[0], values[1] if len(values) > 1 else None))
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+    parser.add_argument(
+        "--runtime", nargs='*', default=["h_rt", "d_rt"], metavar="resource",
+        help="Resources of `-l` compared with the time limit of jobs."
+    )
+    parser.add_argument(
+        "--memory", nargs='*', default=["mem_req", "s_vmem"], metavar="resource",
+        help="Resources of `-l` compared with the requested memory of jobs."
+    )
+
+    uge = parser.add_argument_group(
+        title="qselect options",
+        description="UGE qselect options"
+    )
+    set_qselect_arguments(uge)
+
+
+def set_qselect_arguments(uge):
+    uge.add_argument("-l", nargs=1, action=appendkv, metavar="resource=value,...",
+                     help="Select jobs whose requests fit into the given time or "
+                          "memory. Other resource names select partitions.")
+    uge.add_argument("-pe", nargs='+', action=_appendpe, metavar=("pe_name", "slot_range"),
+                     help="Select jobs whose number of CPUs is within the slot range.")
+    uge.add_argument("-q", nargs=1, action=appendkv, metavar="wc_queue_list")
+    uge.add_argument("-s", nargs=1, action=singlearg, metavar="{p|r|s|h}")
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="user_list")
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -1,10 +1,126 @@
+from __future__ import print_function
+
+import sys
 import logging
 
-from uge2slurm.utils.log import entrypoint, suggest_slurm
+from uge2slurm.utils.log import entrypoint
+from uge2slurm.utils.hostlist import compress_hostlist
+from uge2slurm.utils.output import ChunkedWriter
+from uge2slurm.utils.squeue import iter_jobs
+
+from .argparser import get_parser, parser_args
+from .formatter import TextFormatter, XMLFormatter, is_held
+from .detail import get_job_details, format_job_detail
 
 logger = logging.getLogger(__name__)
 
+_STATE_OPTION_MAPPER = dict(
+    p=("PENDING", ),
+    r=("RUNNING", "COMPLETING", "CONFIGURING"),
+    s=("SUSPENDED", "STOPPED")
+)
+# squeue states of jobs written into `<job_info>` and `<queue_info>` by `-xml`
+_PENDING_STATES = ("PENDING", "RESV_DEL_HOLD", "SPECIAL_EXIT")
+_ACTIVE_STATES = ("RUNNING", "COMPLETING", "CONFIGURING", "SUSPENDED", "STOPPED", "REQUEUED",
+                  "REQUEUE_FED", "REQUEUE_HOLD", "RESIZING", "SIGNALING", "STAGE_OUT",
+                  "PREEMPTED", "REVOKED")
+
 
 @entrypoint(logger)
 def main():
-    suggest_slurm("qstat", "squeue")
+    parser = get_parser()
+    args = parser.parse_args()
+    return run(args)
+
+
+def run(args):
+    if args.j is not None:
+        return _show_job_details(args.j)
+
+    squeue_args, states = _get_squeue_args(args)
+
+    hold_only = args.s is not None and 'h' in args.s
+    formatter_class = XMLFormatter if args.xml else TextFormatter
+
+    with ChunkedWriter() as writer:
+        formatter = formatter_class(writer)
+        for states_args in _get_states_passes(states, args.xml):
+            for job in iter_jobs(squeue_args + states_args):
+                if hold_only and not is_held(job):
+                    continue
+                formatter.write(job)
+        formatter.close()
+
+
+def _get_states_passes(states, xml):
+    """
+    Return `--states` options of each `squeue` call. `-xml` reads running and
+    pending jobs by separate calls so that the sections are written in order
+    without keeping jobs in memory.
+    """
+    if not xml:
+        return [["--states", ','.join(states)] if states else []]
+
+    passes = []
+    for group in (_ACTIVE_STATES, _PENDING_STATES):
+        selected = [state for state in group if not states or state in states]
+        if selected:
+            passes.append(["--states", ','.join(selected)])
+    return passes
+
+
+def _show_job_details(job_list):
+    groups, missing = get_job_details(job_list)
+
+    with ChunkedWriter() as writer:
+        for group in groups:
+            writer.write(format_job_detail(group) + '\n')
+
+    if missing:
+        print("Following jobs do not exist or permissions are not sufficient: ", file=sys.stderr)
+        print(', '.join(missing), file=sys.stderr)
+        return 1
+
+
+def _get_squeue_args(args):
+    # running jobs come first, then pending ones (pending is the smallest state value)
+    squeue_args = ["--sort", "-t,i"]
+
+    if args.u is None:
+        squeue_args.append("--me")
+    elif '*' not in args.u:
+        squeue_args += ["--user", ','.join(args.u)]
+
+    states = []
+    if args.s is not None:
+        for option in args.s:
+            if option in _STATE_OPTION_MAPPER:
+                states += [s for s in _STATE_OPTION_MAPPER[option]]
+            elif option == 'h':
+                states.append("PENDING")
+            elif option in ('a', 'u', 'o', 'd', 'j'):  # `-s a` and hold types
+                pass
+            else:
+                logger.warning('Unknown job state "{}" for "-s" was ignored.'.format(option))
+
+    if args.q is not None:
+        partitions = []
+        hosts = []
+        for queue in args.q:
+            text = queue.split('@', 1)
+            if text[0] and text[0] != '*':
+                partitions.append(text[0])
+            if len(text) == 2 and text[1]:
+                hosts.append(text[1])
+        if partitions:
+            squeue_args += ["--partition", ','.join(partitions)]
+        if hosts:
+            squeue_args += ["--nodelist", compress_hostlist(hosts)]
+
+    return squeue_args, sorted(set(states))
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, **parser_args)
+    get_parser(parser)
+    parser.set_defaults(func=run)
@@ -0,0 +1,37 @@
+import argparse
+
+from uge2slurm.commands.argparser import set_common_args
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+from ..qsub.argparser import singlearg, appendkv
+
+parser_args = dict(
+    description="Mapping UGE qstat command to slurm",
+    add_help=False,
+    formatter_class=HelpFormatter
+)
+
+
+def _set_parser(parser):
+    set_common_args(parser)
+
+    uge = parser.add_argument_group(
+        title="qstat options",
+        description="UGE qstat options"
+    )
+    set_qstat_arguments(uge)
+
+
+def set_qstat_arguments(uge):
+    uge.add_argument("-j", nargs=1, action=appendkv, metavar="job_list")
+    uge.add_argument("-q", nargs=1, action=appendkv, metavar="wc_queue_list")
+    uge.add_argument("-s", nargs=1, action=singlearg, metavar="{p|r|s|h|a}")
+    uge.add_argument("-u", nargs=1, action=appendkv, metavar="user_list")
+    uge.add_argument("-xml", action="store_true", default=None)
+
+
+def get_parser(parser=None):
+    if not parser:
+        parser = argparse.ArgumentParser(**parser_args)
+    _set_parser(parser)
+    return parser
@@ -0,0 +1,152 @@
+import re
+import logging
+from fnmatch import fnmatchcase
+from datetime import datetime
+from collections import OrderedDict
+
+from uge2slurm.utils.scontrol import iter_show
+from uge2slurm.utils.units import parse_duration
+from uge2slurm.utils.ranges import parse_task_ranges, format_ge_ranges
+
+logger = logging.getLogger(__name__)
+
+_SEPARATOR = '=' * 62
+_NAME_WITH_ID = re.compile(r"^(.*)\((\d+)\)$")
+_PENDING_STATES = ("PENDING", "REQUEUE_HOLD", "SPECIAL_EXIT")
+
+
+class _JobGroup(object):
+    """Array tasks grouped back under their parent job."""
+    def __init__(self, job_number, record):
+        self.job_number = job_number
+        self.record = record
+        self.task_ids = []
+        self.exec_hosts = []
+
+    def add(self, record):
+        task_id = record.get("ArrayTaskId")
+        if task_id is None:
+            return
+        task_id = task_id.split('%', 1)[0]
+        self.task_ids += parse_task_ranges(task_id)
+
+        if record.get("JobState") not in _PENDING_STATES:
+            self.exec_hosts.append((task_id, record.get("NodeList"), record.get("NumCPUs")))
+        else:
+            # use a pending record as the representative one
+            self.record = record
+
+
+def get_job_details(job_list):
+    """
+    Collect records of the given job ids or names from a single
+    `scontrol show job` call. Ids of array tasks select their whole array job.
+    """
+    ids = set(job for job in job_list if job.isdigit())
+    patterns = [job for job in job_list if not job.isdigit()]
+
+    records = OrderedDict()
+    found = set()
+    for record in iter_show("job"):
+        job_id = record.get("ArrayJobId", record.get("JobId"))
+        records.setdefault(job_id, []).append(record)
+        matched = ids.intersection((record.get("JobId"), job_id))
+        matched.update(p for p in patterns if fnmatchcase(record.get("JobName", ''), p))
+        if matched:
+            found.update(matched)
+            found.add(job_id)
+
+    groups = []
+    for job_id, job_records in records.items():
+        if job_id not in found:
+            continue
+        group = _JobGroup(job_id, job_records[0])
+        for record in job_records:
+            group.add(record)
+        groups.append(group)
+
+    missing = [job for job in job_list if job not in found]
+    return groups, missing
+
+
+def _split_name_id(value):
+    match = _NAME_WITH_ID.match(value or '')
+    if match:
+        return match.groups()
+    return value, None
+
+
+def _format_datetime(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").strftime("%a %b %d %H:%M:%S %Y")
+    except (TypeError, ValueError):
+        return value
+
+
+def _format_path(value):
+    if not value:
+        return None
+    return "NONE:NONE:" + value
+
+
+def _get_resource_list(record):
+    resources = []
+    time_limit = parse_duration(record.get("TimeLimit"))
+    if time_limit is not None:
+        resources.append("h_rt={}".format(int(time_limit)))
+    for key in ("MinMemoryCPU", "MinMemoryNode"):
+        if key in record:
+            resources.append("mem_req={}".format(record[key]))
+            break
+    if record.get("TRES"):
+        resources.append("tres={}".format(record["TRES"]))
+    return ','.join(resources)
+
+
+def format_job_detail(group):
+    record = group.record
+    owner, uid = _split_name_id(record.get("UserId"))
+    group_name, gid = _split_name_id(record.get("GroupId"))
+
+    nice = record.get("Nice")
+    fields = [
+        ("job_number", group.job_number),
+        ("submission_time", _format_datetime(record.get("SubmitTime"))),
+        ("owner", owner),
+        ("uid", uid),
+        ("group", group_name),
+        ("gid", gid),
+        ("sge_o_workdir", record.get("WorkDir")),
+        ("account", record.get("Account")),
+        ("cwd", record.get("WorkDir")),
+        ("stderr_path_list", _format_path(record.get("StdErr"))),
+        ("hard resource_list", _get_resource_list(record)),
+        ("mail_list", record.get("MailUser")),
+        ("job_name", record.get("JobName")),
+        ("stdout_path_list", _format_path(record.get("StdOut"))),
+        ("stdin_path_list", _format_path(record.get("StdIn"))),
+        ("priority", None if nice is None else str(-int(nice))),
+        ("hard_queue_list", record.get("Partition")),
+        ("jid_predecessor_list", record.get("Dependency")),
+        ("script_file", record.get("Command")),
+        ("slots", record.get("NumCPUs")),
+    ]
+    if group.task_ids:
+        fields.append(("job-array tasks", format_ge_ranges(group.task_ids)))
+
+    lines = [_SEPARATOR]
+    for key, value in fields:
+        if value in (None, '', "(null)"):
+            continue
+        lines.append("{:<28}{}".format(key + ':', value))
+
+    exec_hosts = group.exec_hosts
+    if not exec_hosts and record.get("JobState") not in _PENDING_STATES:
+        exec_hosts = [('1', record.get("NodeList"), record.get("NumCPUs"))]
+    for task_id, nodelist, cpus in exec_hosts:
+        lines.append("{:<28}{}:{}".format("exec_host_list {:>5}:".format(task_id), nodelist, cpus))
+
+    if record.get("JobState") in _PENDING_STATES and record.get("Reason") not in (None, "None"):
+        lines.append("{:<28}{}".format("scheduling info:", record.get("Reason")))
+
+    return '\n'.join(lines)
@@ -0,0 +1,165 @@
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+
+from uge2slurm.utils.hostlist import get_first_host
+
+_STATE_MAPPER = {
+    "PD": "qw",
+    "R": "r",
+    "CG": "r",
+    "CF": "t",
+    "S": "s",
+    "ST": "T",
+    "RQ": "Rq",
+    "RS": "Rq",
+    "RH": "Rq",
+    "SE": "Eqw",
+    "SI": "r",
+    "SO": "r",
+    "RD": "hqw",
+    "RF": "Rq",
+    "RV": "r",
+    "PR": "dr",
+}
+_HOLD_REASONS = ("JobHeldUser", "JobHeldAdmin", "Dependency", "BeginTime")
+
+
+def is_pending(job):
+    return job.state in ("PD", "RD", "SE")
+
+
+def is_held(job):
+    """Jobs shown in the `h` state, which are also selected by `-s h`."""
+    return job.state == "RD" or (is_pending(job) and job.reason in _HOLD_REASONS)
+
+
+def get_state(job):
+    state = _STATE_MAPPER.get(job.state, job.state)
+    if is_held(job) and not state.startswith('h'):
+        state = 'h' + state
+    return state
+
+
+def get_task_ids(job):
+    """Convert Slurm array task specification into UGE `n-m:s` notation."""
+    if job.task_id is None:
+        return None
+
+    task_ids = job.task_id.split('%', 1)[0]
+    ranges = []
+    for task_range in task_ids.split(','):
+        if '-' in task_range and ':' not in task_range:
+            task_range += ":1"
+        ranges.append(task_range)
+    return ','.join(ranges)
+
+
+def get_queue(job):
+    if is_pending(job) or not job.nodelist or job.nodelist == "(null)":
+        return ''
+    # UGE shows the master host
+    return "{}@{}".format(job.partition, get_first_host(job.nodelist))
+
+
+def get_datetime(job):
+    return job.submit_time if is_pending(job) else job.start_time
+
+
+def get_priority(job):
+    try:
+        return float(job.priority)
+    except ValueError:
+        return 0.
+
+
+def _format_datetime(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").strftime("%m/%d/%Y %H:%M:%S")
+    except ValueError:
+        return value
+
+
+class TextFormatter(object):
+    HEADER = ("job-ID  prior   name       user         state submit/start at     "
+              "queue                          slots ja-task-ID ")
+    ROW = "{:>7} {:7.5f} {:<10.10} {:<12.12} {:<5} {:<19} {:<30.30} {:>5} {}\n"
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._header_written = False
+
+    def write(self, job):
+        if not self._header_written:
+            self.writer.write(self.HEADER + '\n' + '-' * len(self.HEADER) + '\n')
+            self._header_written = True
+
+        task_ids = get_task_ids(job)
+        self.writer.write(self.ROW.format(
+            job.array_job_id,
+            get_priority(job),
+            job.name,
+            job.user,
+            get_state(job),
+            _format_datetime(get_datetime(job)),
+            get_queue(job),
+            job.cpus,
+            '' if task_ids is None else task_ids
+        ))
+
+    def close(self):
+        pass
+
+
+class XMLFormatter(object):
+    """
+    Write `qstat -xml` elements one by one. Running jobs must come before
+    pending ones since `<queue_info>` section is closed by the first pending
+    job.
+    """
+    HEAD = ("<?xml version='1.0'?>\n"
+            "<job_info  xmlns:xsd=\"http://arc.liv.ac.uk/repos/darcs/sge/source/dist/"
+            "util/resources/schemas/qstat/qstat.xsd\">\n"
+            "  <queue_info>\n")
+    SECTION_BREAK = ("  </queue_info>\n"
+                     "  <job_info>\n")
+    TAIL = ("  </job_info>\n"
+            "</job_info>\n")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self._in_job_info = False
+        self.writer.write(self.HEAD)
+
+    def write(self, job):
+        pending = is_pending(job)
+        if pending and not self._in_job_info:
+            self.writer.write(self.SECTION_BREAK)
+            self._in_job_info = True
+
+        if pending:
+            time_tag = "JB_submission_time"
+        else:
+            time_tag = "JAT_start_time"
+
+        elements = [
+            "    <job_list state={}>\n".format(quoteattr("pending" if pending else "running")),
+            "      <JB_job_number>{}</JB_job_number>\n".format(escape(job.array_job_id)),
+            "      <JAT_prio>{:.5f}</JAT_prio>\n".format(get_priority(job)),
+            "      <JB_name>{}</JB_name>\n".format(escape(job.name)),
+            "      <JB_owner>{}</JB_owner>\n".format(escape(job.user)),
+            "      <state>{}</state>\n".format(escape(get_state(job))),
+            "      <{0}>{1}</{0}>\n".format(time_tag, escape(get_datetime(job))),
+            "      <queue_name>{}</queue_name>\n".format(escape(get_queue(job))),
+            "      <slots>{}</slots>\n".format(escape(job.cpus))
+        ]
+        task_ids = get_task_ids(job)
+        if task_ids is not None:
+            elements.append("      <tasks>{}</tasks>\n".format(escape(task_ids)))
+        elements.append("    </job_list>\n")
+
+        self.writer.write(''.join(elements))
+
+    def close(self):
+        if not self._in_job_info:
+            self.writer.write(self.SECTION_BREAK)
+        self.writer.write(self.TAIL)
@@ -1,8 +1,12 @@
+from __future__ import print_function
+
+import re
 import logging
 
 from uge2slurm.utils.path import get_command_path
 from uge2slurm.utils.log import entrypoint, print_command, is_interactive, confirm_command
 from uge2slurm.utils.slurm import run_command
+from uge2slurm.utils.submitlog import record_submission
 from uge2slurm.commands import UGE2slurmCommandError
 
 from .argparser import get_parser, parser_args
@@ -32,11 +36,17 @@ def run(args):
             binary = command_name
 
     converter = CommandMapper(command_name, dry_run=args.dry_run)
+    _submit(args, converter)
+
+
+def _submit(args, converter):
     command = converter.convert(args)
 
     if args.dry_run:
         logger.debug(args)
         print_command(command)
+        if converter.batch_script is not None:
+            logger.debug("job script passed via stdin:\n" + converter.batch_script)
         return
 
     if is_interactive() and not args.non_interactive:
@@ -44,7 +54,21 @@ def run(args):
         if res is False:
             return
 
-    run_command(None, command, stdout=None, stderr=None)
+    # keep the job id to record the submission for qresub and later right-sizing
+    res = run_command(None, command, stderr=None, input=converter.batch_script)
+    print(res.stdout, end='')
+
+    jobid = re.search(r"\d+", res.stdout or '')
+    if jobid:
+        script_path = None if args.b else converter.jobscript_path
+        try:
+            record_submission(jobid.group(), command, converter.script_hash, script_path,
+                              converter.batch_script)
+        except (IOError, OSError) as e:
+            logger.warning("failed to record the submission: {}".format(e))
+
+    if args.rightsize is not None:
+        converter.record_script(res.stdout)
 
 
 def set_subperser(name, subparsers):
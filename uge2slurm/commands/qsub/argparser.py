@@ -45,15 +45,6 @@ class appendsingle(argparse.Action):
             container.append(values[0])
 
 
-class nargs1or2(argparse.Action):
-    def __call__(self, parser, namespace, values, option_string):
-        if not 1 <= len(values) <= 2:
-            parser.error(
-                'argument {}: expected 1 or 2 arguments'.format(self.dest)
-            )
-        setattr(namespace, self.dest, values)
-
-
 class set_resource_state(argparse.Action):
     def __call__(self, parser, namespace, values, option_string):
         parser.resouce_state = self.dest
@@ -84,6 +75,12 @@ class store_bool(singlearg):
             )
 
 
+def _aggregate_logs_type(value):
+    if value == "node" or (value.isdigit() and int(value) > 0):
+        return value
+    raise argparse.ArgumentTypeError('expect "node" or a positive number: "{}"'.format(value))
+
+
 def _set_parser(parser):
     set_orig_argsuments(parser)
 
@@ -110,12 +107,56 @@ def set_orig_argsuments(parser):
              "option. If multiple values are specified, the first valid value "
              "will be used."
     )
+    parser.add_argument(
+        "--tmp", nargs='*', default=["tmp_req"], metavar="resource",
+        help="Specify which resource value should be mapped into `--tmp` "
+             "option. If multiple values are specified, the first valid value "
+             "will be used."
+    )
+    parser.add_argument(
+        "--tmpdir", metavar="path",
+        help="Node-local scratch directory where the job's TMPDIR is created. "
+             "Default is /tmp."
+    )
+    parser.add_argument(
+        "--no-tmpdir", action="store_true",
+        help="Do not create the private TMPDIR of the job, e.g. if the cluster "
+             "provides it. The wrapper script then replaces itself with the job "
+             "script instead of waiting for it to clean up."
+    )
     parser.add_argument(
         "--cpus", nargs='*', default=["def_slot"], metavar="parallel_env",
         help="Specify which parallel_environment should be mapped into "
-             "`--cpus-per-task` option. If multiple values are specified, the "
-             "first valid value will be used. Note that range values are not "
-             "supported and its minimum value will be used as the number of cpus."
+             "`--cpus-per-task` option (allocation rule $pe_slots). If a range "
+             "of slots is requested, the number of cpus which is expected to "
+             "start earliest is chosen by `sbatch --test-only`."
+    )
+    parser.add_argument(
+        "--pe-rule", nargs='*', default=[], metavar="parallel_env=allocation_rule",
+        help="Specify allocation rules ($pe_slots, $fill_up, $round_robin or a "
+             "fixed number of slots per host) of parallel environments to map "
+             "`-pe` into `--ntasks`, `--ntasks-per-node` and `--nodes` options. "
+             "Parallel environments specified by `--cpus` are $pe_slots."
+    )
+    parser.add_argument(
+        "--pe-table", action="append", default=[], metavar="path",
+        help="Read allocation rules of parallel environments from a file "
+             "of `qconf -sp` outputs. `--pe-rule` takes precedence. This option "
+             "can be specified multiple times."
+    )
+    parser.add_argument(
+        "--runtime", nargs='*', default=["h_rt", "d_rt"], metavar="resource",
+        help="Specify which resource value should be mapped into `--time` "
+             "option. If multiple values are specified, the first valid value "
+             "will be used."
+    )
+    parser.add_argument(
+        "--soft-runtime", nargs='*', default=["s_rt"], metavar="resource",
+        help="Specify which resource value should be mapped into `--signal` "
+             "option to send SIGUSR1 when the time is reached. If no `--runtime` "
+             "resource is given, it is also used as `--time` with a short grace "
+             "period. If multiple values are specified, the first valid value "
+             "will be used."
     )
     parser.add_argument(
         "--partition", nargs='*', metavar="resource=partition", default=[],
@@ -123,6 +164,54 @@ def set_orig_argsuments(parser):
              "(queue) via `--partition` option. Resource-partition pairs must be "
              "specified by '=' separated strings."
     )
+    parser.add_argument(
+        "--keep-script", action="store_true",
+        help="Write the job script given by stdin or the command line of a "
+             "binary job (`-b y`) into a file in the home directory and submit "
+             "it instead of passing it via stdin or `--wrap`."
+    )
+    parser.add_argument(
+        "--aggregate-logs", type=_aggregate_logs_type, metavar="node|N",
+        help="Append outputs of array tasks into shared files per node or per "
+             "N tasks with index files instead of creating files for each task. "
+             "Use `uge2slurm logs` to extract the output of a task."
+    )
+    parser.add_argument(
+        "--stage", action="store_true",
+        help="Copy the job script and the input file given by `-i` into the "
+             "node-local scratch once per node (or by `sbcast` for multi-node "
+             "jobs) and use the copies in the job."
+    )
+    parser.add_argument(
+        "--stage-in", action="append", default=[], metavar="path",
+        help="Additional file to be staged like `--stage`. Arguments of the "
+             "job which match the path are replaced with the staged path. This "
+             "option can be specified multiple times."
+    )
+    parser.add_argument(
+        "--srun", action="store_true",
+        help="Launch the job script by `srun` as a job step instead of running "
+             "it directly in the batch step."
+    )
+    parser.add_argument(
+        "--rightsize", choices=("suggest", "apply"),
+        help="Look up the local accounting database (see `uge2slurm acct sync`) "
+             "for recent jobs submitted by the same user with the same script or "
+             "job name, then suggest or apply tighter `--mem-per-cpu` and "
+             "`--time` values computed from their MaxRSS and Elapsed."
+    )
+    parser.add_argument(
+        "--rightsize-percentile", type=float, default=95., metavar="percentile",
+        help="Percentile of the history used by `--rightsize`. Default is 95."
+    )
+    parser.add_argument(
+        "--rightsize-headroom", type=float, default=1.2, metavar="ratio",
+        help="Multiply suggested values by this ratio. Default is 1.2."
+    )
+    parser.add_argument(
+        "--rightsize-samples", type=int, default=5, metavar="N",
+        help="Minimum number of completed jobs required to suggest values. Default is 5."
+    )
 
 
 def set_qsub_arguments(uge):
@@ -133,7 +222,8 @@ def set_qsub_arguments(uge):
     uge.add_argument("-ar", nargs=1, action=singlearg, metavar="ar_id")
     uge.add_argument("-A", nargs=1, action=singlearg, metavar="account_string")
     uge.add_argument("-bgio", nargs=1, action=appendkv, metavar="bgio_params")
-    uge.add_argument("-binding", nargs='+', action=nargs1or2)
+    # the command following `-binding` is also consumed and split at `CommandMapper.pre_convert`
+    uge.add_argument("-binding", nargs='+', metavar="[binding_instance] binding_strategy")
     uge.add_argument("-b", nargs=1, action=store_bool, metavar="y[es]|n[o]")
     uge.add_argument("-c", nargs=1, action=singlearg, metavar="occasion_specifier")
     uge.add_argument("-ckpt", nargs=1, action=singlearg, metavar="ckpt_name")
@@ -0,0 +1,36 @@
+import hashlib
+import logging
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.submitlog import get_spool_path, spool_data
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value):
+    return value if isinstance(value, bytes) else value.encode("utf-8")
+
+
+def make_export_content(variables):
+    """Return `NAME=value` pairs separated by null characters for `sbatch --export-file`."""
+    return b''.join(
+        _encode(name) + b'=' + _encode(value) + b'\0'
+        for name, value in sorted(variables.items())
+    )
+
+
+def write_export_file(variables, dry_run=False):
+    """
+    Write the variables into the spool of the submission log. Files are named
+    by their content hash so that identical environments share one file, which
+    is also read by qresub.
+    """
+    content = make_export_content(variables)
+    if dry_run:
+        logger.info("export file is not written in dry run: " + ", ".join(sorted(variables)))
+        return get_spool_path(hashlib.sha1(content).hexdigest())
+
+    try:
+        return get_spool_path(spool_data(content))
+    except (IOError, OSError) as e:
+        raise UGE2slurmCommandError("failed to write export file: {}".format(e))
@@ -7,19 +7,29 @@ import shlex
 import random
 import string
 import re
+import hashlib
+from math import ceil
 from gettext import gettext
 from datetime import datetime
 from collections import defaultdict
 from functools import reduce
 from uge2slurm.utils.py2.functools import partialmethod
+from uge2slurm.utils.py2.shlex import quote
 
 from uge2slurm import UGE2slurmError
 from uge2slurm.mapper import CommandMapperBase, bind_to, bind_if_true, not_implemented, not_supported, mapmethod
 from uge2slurm.commands import UGE2slurmCommandError, WRAPPER_DIR
+from uge2slurm.utils.acctdb import open_database
+from uge2slurm.utils.hostlist import compress_hostlist
+from uge2slurm.utils.units import parse_memory, parse_duration, parse_ge_duration, format_duration
 
 from .squeue import get_running_jobs
 from .sinfo import get_partitions
 from .argparser import set_qsub_arguments
+from .rightsize import suggest_limits
+from .sbatch import get_expected_start
+from .envfile import write_export_file
+from .petable import PE_SLOTS, FILL_UP, ROUND_ROBIN, PETable, parse_allocation_rule, parse_slot_ranges
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +53,11 @@ class CommandMapper(CommandMapperBase):
         a=("FAIL", "REQUEUE")
     )
     _HOME = os.path.expanduser('~')
+    _BINDING_INSTANCES = ("set", "env", "pe")
+    # seconds between SIGUSR1 and SIGKILL when only the soft limit is given
+    _SOFT_RUNTIME_GRACE = 60
+    # upper limit of `sig_time` of `--signal`
+    _MAX_SIGNAL_TIME = 65535
 
     WRAPPER_PATH = os.path.join(WRAPPER_DIR, "uge2slurm-qsubwrapper.sh")
 
@@ -86,7 +101,7 @@ class CommandMapper(CommandMapperBase):
 
         if is_output:
             if os.path.isdir(path):
-                filename = self._get_default_filename(option_string)
+                filename = os.path.basename(self._get_default_filename(option_string))
                 path = os.path.join(path, filename)
             elif os.path.isfile(path):
                 self._logger.warning('output file specified by "{}" will be overwritten.'.format(option_name))
@@ -102,12 +117,16 @@ class CommandMapper(CommandMapperBase):
                             raise UGE2slurmCommandError("failed to create log output directory.")
                         self._logger.info('directory "{}" was created for output.'.format(dirname))
 
-                filename = filename.replace('%', "%%")
-                filename = filename.replace("$USER", "%u")
-                filename = filename.replace("$JOB_ID", "%j")
-                filename = filename.replace("$JOB_NAME", "%x")
-                filename = filename.replace("$HOSTNAME", "%N")
-                filename = filename.replace("$TASK_ID", "%a")
+                if filename:
+                    filename = filename.replace('%', "%%")
+                    filename = filename.replace("$USER", "%u")
+                    filename = filename.replace("$JOB_ID", "%j")
+                    filename = filename.replace("$JOB_NAME", "%x")
+                    filename = filename.replace("$HOSTNAME", "%N")
+                    filename = filename.replace("$TASK_ID", "%a")
+                else:
+                    # a path ending with a separator is a directory to be created
+                    filename = os.path.basename(self._get_default_filename(option_string))
 
                 path = os.path.join(dirname, filename)
 
@@ -133,7 +152,8 @@ class CommandMapper(CommandMapperBase):
     adds = not_implemented("-adds")
     ar = bind_to("--reservation")
     A = bind_to("--account")
-    binding = not_implemented("-binding")
+    # `binding` and `mbind` are processed at post_convert with the number of slots
+    # binding
     # handle `b` at `run` function in `__init__`
     c = not_supported("-c")
     ckpt = not_supported("-ckpt")
@@ -158,7 +178,15 @@ class CommandMapper(CommandMapperBase):
     # `hold_jid` and `hold_jid_ad` will be solved together
     # hold_jid
     # hold_jid_ad
-    i = partialmethod(_map_path, option_name="-i", bind_to="--input", option_string='i', is_output=False)
+
+    def i(self, value):
+        additional_args = self._map_path(value, "-i", "--input", 'i', is_output=False)
+        if self._is_staging():
+            # the wrapper redirects stdin from the staged file
+            self.stage_stdin = additional_args[1]
+            return
+        return additional_args
+
     # handle `j` at pre_ and post_convert
     # j
     jc = not_supported("-jc")
@@ -182,6 +210,66 @@ class CommandMapper(CommandMapperBase):
                 additional_args += ["--mem-per-cpu", hard_resources[memkey]]
                 break
 
+        for tmpkey in self._args.tmp:
+            if tmpkey in hard_resources:
+                additional_args += ["--tmp", hard_resources[tmpkey]]
+                break
+
+        #
+        additional_args += self._map_runtime(hard_resources)
+
+        return additional_args
+
+    def _get_runtime(self, resources, resource_names):
+        for name in resource_names:
+            if name in resources:
+                value = resources[name]
+                if value is None:
+                    raise UGE2slurmCommandError('time value is required for "{}".'.format(name))
+                try:
+                    seconds = parse_ge_duration(value)
+                except ValueError:
+                    raise UGE2slurmCommandError('invalid time value "{}={}".'.format(name, value))
+                # `--time 0` means no limit in Slurm
+                if seconds is not None and seconds <= 0:
+                    raise UGE2slurmCommandError('time value must be positive: "{}={}".'.format(name, value))
+                return name, seconds
+        return None, None
+
+    def _map_runtime(self, resources):
+        hard_name, hard = self._get_runtime(resources, self._args.runtime)
+        soft_name, soft = self._get_runtime(resources, self._args.soft_runtime)
+
+        if hard_name is None and soft is not None:
+            self._logger.warning("only soft runtime limit is specified by `{}`. the job will be killed "
+                                 "{} seconds after the limit.".format(soft_name, self._SOFT_RUNTIME_GRACE))
+            hard = soft + self._SOFT_RUNTIME_GRACE
+
+        additional_args = []
+        if hard is not None:
+            additional_args += ["--time", format_duration(hard)]
+
+        if soft is not None:
+            signal_time = None if hard is None else hard - soft
+            if signal_time is None:
+                self._logger.warning("soft runtime limit `{}` requires finite hard limit. "
+                                     "ignored.".format(soft_name))
+            elif signal_time <= 0:
+                self._logger.warning("soft runtime limit `{}` is not shorter than hard limit `{}`. "
+                                     "ignored.".format(soft_name, hard_name))
+            else:
+                if signal_time > self._MAX_SIGNAL_TIME:
+                    self._logger.warning("soft runtime limit `{}` is too far from the hard limit. "
+                                         "SIGUSR1 will be sent {} seconds before the end of the "
+                                         "job.".format(soft_name, self._MAX_SIGNAL_TIME))
+                    signal_time = self._MAX_SIGNAL_TIME
+                # without `srun`, the job script runs in the batch step which
+                # is signaled only when `B:` is specified
+                signal = "USR1@{}".format(signal_time)
+                if not self._args.srun:
+                    signal = "B:" + signal
+                additional_args += ["--signal", signal]
+
         return additional_args
 
     def _map_partition(self, hard_resources, soft_resources):
@@ -297,7 +385,7 @@ class CommandMapper(CommandMapperBase):
 
     masterq = not_supported("-masterq")
     mods = not_implemented("-mods")
-    mbind = not_implemented("-mbind")
+    # mbind
     notify = not_implemented("-notify")  # use `--signal`?
     now = not_implemented("-now")
     N = bind_to("--job-name")
@@ -305,54 +393,98 @@ class CommandMapper(CommandMapperBase):
     ot = not_implemented("-ot")
     P = bind_to("--wckey")
     p = bind_to("--nice")
-    par = not_implemented("-par")
 
-    def pe(self, value):
-        additional_args = []
+    def par(self, value):
+        # `-par` overrides the allocation rule at `pe`
+        if self._args.pe is None:
+            self._logger.warning("`-par` is ignored without `-pe`.")
 
-        #
-        parallel_env = {}
-        for k, v in value:
-            ranges = tuple(sorted(
-                tuple((int(i) if i != '' else 0) for i in range.split('-'))
-                for range in v.split(',')
+    def pe(self, value):
+        pe_name, slots = self._select_pe(value)
+        rule = self._get_allocation_rule(pe_name)
+        ranges = parse_slot_ranges(slots)
+
+        lower, upper = ranges[0][0], ranges[-1][1]
+        if len(ranges) == 1 and lower == upper:
+            self.nslots = lower
+            return self._map_pe_layout(rule, lower)
+
+        self.nslots = lower
+        if upper is None:
+            self._logger.warning("open slot range `{}` is not supported. Use {} as the maximum.".format(
+                slots, max(r[0] for r in ranges)
             ))
-            parallel_env[k] = ranges
-
-        #
-        available_pe = None
-        for pe_name in self._args.cpus:
-            if pe_name in parallel_env:
-                if available_pe is None:
-                    pe = available_pe = parallel_env[pe_name]
-                else:
-                    pe = parallel_env[pe_name]
-                if len(pe) == 1 and len(pe[0]) == 1:
-                    additional_args += ["--cpus-per-task", pe[0][0]]
-                    available_pe = None
-                    break
-
-        if available_pe is not None:
-            min_pe = pe[0][0]
-            if min_pe == 0:
-                min_pe = 1
-            self._logger.warning("Range value for `-pe` is not supported. Use minimum value: {}".format(min_pe))
-            additional_args += ["--cpus-per-task", min_pe]
-
-        return additional_args
+            upper = max(r[0] for r in ranges)
+            ranges = [(l, upper if u is None else u) for l, u in ranges]
+
+        if isinstance(rule, int):
+            # the number of tasks on each node is fixed; let slurm choose the number of nodes
+            if lower % rule or upper % rule:
+                self._logger.warning("slot range `{}` is not a multiple of allocation rule {}.".format(slots, rule))
+            if len(ranges) > 1:
+                self._logger.warning("slot range `{}` is not contiguous. Use {}-{}.".format(slots, lower, upper))
+            nodes = (int(ceil(float(lower) / rule)), upper // rule or 1)
+            return ["--ntasks-per-node", rule, "--nodes", "{}-{}".format(*nodes)]
+
+        candidates = sorted(set(n for r in ranges for n in r))
+        if len(candidates) == 1:
+            return self._map_pe_layout(rule, lower)
+
+        # choose the candidate which will start earliest at `post_convert`
+        self._pe_candidates = [(n, self._map_pe_layout(rule, n)) for n in candidates]
+
+    def _select_pe(self, value):
+        if len(value) > 1:
+            self._logger.warning("multiple `-pe` options are specified. use the last one.")
+        pe_name, slots = value[-1]
+        return pe_name, slots
+
+    def _get_allocation_rule(self, pe_name):
+        if self._args.par is not None:
+            return parse_allocation_rule(self._args.par)
+        if pe_name in self._args.cpus:
+            return PE_SLOTS
+
+        rule = PETable(self._args.pe_rule, self._args.pe_table).get(pe_name)
+        if rule is None:
+            self._logger.warning('allocation rule of PE "{}" is unknown. Use "{}". Specify it by '
+                                 '`--pe-rule` or `--pe-table` option.'.format(pe_name, PE_SLOTS))
+            rule = PE_SLOTS
+        else:
+            self._logger.info('allocation rule of PE "{}": {}'.format(pe_name, rule))
+        return rule
+
+    def _map_pe_layout(self, rule, nslots):
+        if rule == PE_SLOTS:
+            return ["--cpus-per-task", nslots]
+        elif rule == FILL_UP:
+            self.distribution[0] = "block"
+            return ["--ntasks", nslots]
+        elif rule == ROUND_ROBIN:
+            self.distribution[0] = "cyclic"
+            return ["--ntasks", nslots, "--spread-job"]
+
+        if nslots % rule:
+            self._logger.warning("the number of slots {} is not a multiple of allocation rule {}.".format(
+                nslots, rule
+            ))
+        return ["--ntasks", nslots, "--ntasks-per-node", rule, "--nodes", int(ceil(float(nslots) / rule))]
 
     pty = not_implemented("-pty")
 
     def q(self, value):
+        if value["soft"]:
+            self._logger.warning("soft queue requests are ignored: " + ','.join(value["soft"]))
+
         hosts = []
-        for queue in value:
+        for queue in value[None]:
             text = queue.split('@', 1)
             if len(text) == 1 or text[1].startswith('@'):
                 self._logger.error('Queue specification at "-q" option requires host name: ' + queue)
             else:
                 hosts.append(text[1])
         if hosts:
-            return ["--nodelist", ','.join(hosts)]
+            return ["--nodelist", compress_hostlist(hosts)]
 
     R = not_implemented("-R")
 
@@ -400,11 +532,24 @@ class CommandMapper(CommandMapperBase):
 
         #
         self.env_vars = {}
+        self.nslots = 1
+        # `--distribution` for nodes and sockets
+        self.distribution = [None, None]
+        self._pe_candidates = None
+        self.stage_stdin = None
+        # the job script passed to sbatch via stdin
+        self.batch_script = None
+        self._command_index = None
         self.script = None
+        self.script_hash = None
         self.jobscript_path = None
 
     # # # pre-convert processing # # #
     def pre_convert(self):
+        #
+        command = self._split_binding(self._args)
+        self._args.command = command + self._args.command
+
         #
         self._load_script()
 
@@ -417,6 +562,15 @@ class CommandMapper(CommandMapperBase):
         for d in (self._args.l, self._args.q):
             self._merge_hard_env(d)
 
+        # `--hint`, `--mem-bind` and socket-level `--distribution` take effect
+        # only on job steps, not on the batch step
+        binding = self._args.binding
+        if not self._args.srun and (self._args.mbind is not None or
+                                    (binding is not None and binding[0] != "env")):
+            self._logger.warning("`-binding` and `-mbind` affect job steps only. "
+                                 "the job script is launched by `srun` (`--srun`).")
+            self._args.srun = True
+
     def _load_script(self):
         temp_script_required = False  # if `-b` was specified or script was input via stdin
 
@@ -445,15 +599,32 @@ class CommandMapper(CommandMapperBase):
                 if self._args.N is None:
                     setattr(self._args, 'N', self.jobscript_path)
 
-        if temp_script_required:
+        if temp_script_required and self._args.keep_script:
             temp_script_path = self._write_script()
             self._logger.warning('Write temporary script to "{}"'.format(temp_script_path))
             self.jobscript_path = temp_script_path
             setattr(self._args, "command", [])
 
         if self.script:
+            script = self.script if isinstance(self.script, bytes) else self.script.encode("utf-8")
+            self.script_hash = hashlib.sha1(script).hexdigest()
             self._load_extra_args()
 
+    @classmethod
+    def _split_binding(cls, namespace):
+        """Split `-binding [instance] strategy` from the following command and return the command."""
+        binding = namespace.binding
+        if binding is None:
+            return []
+
+        if binding[0] in cls._BINDING_INSTANCES:
+            if len(binding) == 1:
+                raise UGE2slurmCommandError("binding strategy is required for `-binding {}`".format(binding[0]))
+            namespace.binding, command = binding[:2], binding[2:]
+        else:
+            namespace.binding, command = ["set", binding[0]], binding[1:]
+        return command
+
     @staticmethod
     def _read_stdin():
         if sys.stdin.isatty():
@@ -495,6 +666,8 @@ class CommandMapper(CommandMapperBase):
         parser.error_prolog = "Invalid argument in the script"
         set_qsub_arguments(parser)
         extra_args = parser.parse_args(shlex.split(args_in_script))
+        if self._split_binding(extra_args):
+            self._logger.warning("extra arguments after `-binding` in the script were ignored.")
 
         for dest, value in vars(extra_args).items():
             if getattr(self._args, dest) is None:
@@ -502,21 +675,30 @@ class CommandMapper(CommandMapperBase):
 
     @staticmethod
     def _merge_hard_env(d):
-        if d is not None and None in d and "hard" in d:
-            d["None"].update(**d["hard"])
+        if d is not None and "hard" in d:
+            d[None] += d.pop("hard")
 
     # # # post-convert processing # # #
     def post_convert(self):
         self._map_dependency()
         self._prepare_output_path()
         self._map_array()
+        self._map_aggregate_logs()
+        self._map_binding()
+        self._map_distribution()
+        self._rightsize()
+        self._map_stage()
 
         self._convert_envvars()
         self._map_environ_vars()
 
+        self._command_index = len(self.args)
         self._set_wrapper()
         self._set_interpreter()
         self._set_script()
+        self._pack_command()
+
+        self._choose_pe_slots()
 
     @mapmethod("hold_jid", "hold_jid_ad")
     def _map_dependency(self, hold_jid, hold_jid_ad):
@@ -525,17 +707,16 @@ class CommandMapper(CommandMapperBase):
             if ids is not None:
                 dependencies |= set(jobid for jobid in ids if not jobid.isdigit())
 
-        if not dependencies:
-            return
-
-        try:
-            name2jobid = get_running_jobs()
-        except UGE2slurmCommandError as e:
-            if self.dry_run:
-                self._logger.warning(e)
-                return
-            else:
-                raise
+        # job ids are used as is and only names are looked up
+        name2jobid = {}
+        if dependencies:
+            try:
+                name2jobid = get_running_jobs()
+            except UGE2slurmCommandError as e:
+                if self.dry_run:
+                    self._logger.warning(e)
+                else:
+                    raise
         running_jids = reduce(lambda a, b: a | b, name2jobid.values(), set())
 
         nonarray_dependencies = []
@@ -544,7 +725,7 @@ class CommandMapper(CommandMapperBase):
                                    (hold_jid, hold_jid_ad)):
             if jids is not None:
                 for jobid in jids:
-                    if jobid in running_jids:
+                    if jobid.isdigit() or jobid in running_jids:
                         container.append(jobid)
                     elif jobid in name2jobid:
                         ds = [str(i) for i in name2jobid[jobid]]
@@ -576,6 +757,34 @@ class CommandMapper(CommandMapperBase):
 
         return additional_args
 
+    def _map_aggregate_logs(self):
+        chunk = self._args.aggregate_logs
+        if chunk is None:
+            return
+        if not self.is_array():
+            self._logger.warning("`--aggregate-logs` is ignored for non-array jobs.")
+            return
+
+        streams = []
+        for option, stream in (("--output", 'o'), ("--error", 'e')):
+            path = self._get_option_value(option)
+            if path is None:
+                continue
+            dirname, filename = os.path.split(path)
+            if filename != os.path.basename(self._get_default_filename(stream)):
+                self._logger.warning('`--aggregate-logs` is ignored because "-{}" specifies a file.'.format(stream))
+                return
+            streams.append((option, stream, dirname or '.'))
+
+        # outputs of the wrapper itself go to a file per array job
+        for option, stream, dirname in streams:
+            self._set_option_value(option, os.path.join(dirname, self._DEFAULT_JOB_NAME.format(stream)).replace(
+                "%j", "%A"
+            ))
+            self.env_vars["UGE2SLURM_LOG_{}_DIR".format(stream.upper())] = dirname
+        self.env_vars["UGE2SLURM_LOG_CHUNK"] = chunk
+        self.args += ["--open-mode", "append"]
+
     @mapmethod('t', "tc")
     def _map_array(self, t, tc):
         if not self.is_array():
@@ -587,6 +796,212 @@ class CommandMapper(CommandMapperBase):
 
         return ["--array", array]
 
+    @mapmethod("binding", "mbind")
+    def _map_binding(self, binding, mbind):
+        additional_args = []
+
+        if binding is not None:
+            instance, strategy = binding
+            if instance == "env":
+                self._logger.warning("`-binding env` is mapped to no binding. "
+                                     "SGE_BINDING is not set in the job.")
+                self.env_vars["SLURM_CPU_BIND"] = "none"
+            else:
+                if instance != "set":
+                    self._logger.warning('binding instance "{}" is not supported. '
+                                         'use "set" instead.'.format(instance))
+                additional_args += self._map_binding_strategy(strategy)
+
+        if mbind is not None:
+            additional_args += self._map_mbind(mbind, binding)
+
+        return additional_args
+
+    def _map_binding_strategy(self, strategy):
+        fields = strategy.split(':')
+        kind = fields[0]
+
+        if kind in ("linear", "striding"):
+            nargs = 2 if kind == "linear" else 3
+            if len(fields) > nargs:
+                self._logger.warning("start position of `-binding {}` is not supported. "
+                                     "Slurm chooses cores to bind.".format(strategy))
+            amount = fields[1] if len(fields) > 1 else None
+            if amount is not None and amount.isdigit() and int(amount) != self.nslots:
+                self._logger.warning("`-binding {}` binds {} cores but Slurm binds to all allocated "
+                                     "{} cpus.".format(strategy, amount, self.nslots))
+
+            if kind == "striding":
+                step = fields[2] if len(fields) > 2 else None
+                if step != '1':
+                    self._logger.warning("step size of `-binding {}` is not supported. cores are "
+                                         "distributed over sockets instead.".format(strategy))
+                    self.distribution[1] = "cyclic"
+                    return ["--hint", "nomultithread"]
+            self.distribution[1] = "block"
+            return ["--hint", "nomultithread"]
+
+        elif kind == "explicit":
+            self._logger.warning("`-binding explicit` is not supported. bind to allocated cores instead.")
+            return ["--hint", "nomultithread"]
+
+        raise UGE2slurmCommandError('unknown binding strategy: "{}"'.format(strategy))
+
+    def _is_staging(self):
+        return self._args.stage or bool(self._args.stage_in)
+
+    def _map_stage(self):
+        if not self._is_staging():
+            return
+
+        paths = list(self._args.stage_in)
+        if not self._args.b and self.jobscript_path is not None:
+            paths.append(self.jobscript_path)
+        if self.stage_stdin is not None:
+            paths.append(self.stage_stdin)
+
+        for path in paths:
+            if ':' in path:
+                raise UGE2slurmCommandError('path including ":" cannot be staged: "{}"'.format(path))
+            if not os.path.isfile(path):
+                raise UGE2slurmCommandError('only regular files can be staged: "{}"'.format(path))
+
+        self.env_vars["UGE2SLURM_STAGE_IN"] = ':'.join(paths)
+        if self.stage_stdin is not None:
+            self.env_vars["UGE2SLURM_STAGE_STDIN"] = self.stage_stdin
+
+    def _map_distribution(self):
+        if self.distribution == [None, None]:
+            return
+        node, socket = self.distribution
+        distribution = node or '*'
+        if socket is not None:
+            distribution += ':' + socket
+        self.args += ["--distribution", distribution]
+
+    def _choose_pe_slots(self):
+        if not self._pe_candidates:
+            return
+
+        wrapper_index = self._command_index
+        lower_args = self._pe_candidates[0][1]
+        if self.dry_run:
+            self._logger.warning("slot range is resolved on submission. Preview with minimum slots: {}".format(
+                self._pe_candidates[0][0]
+            ))
+            self.args[wrapper_index:wrapper_index] = lower_args
+            return
+
+        best = None
+        for nslots, pe_args in self._pe_candidates:
+            args = [str(arg) for arg in self.args[:wrapper_index] + pe_args + self.args[wrapper_index:]]
+            try:
+                start = get_expected_start(args, self.batch_script)
+            except UGE2slurmCommandError as e:
+                self._logger.warning("failed to estimate start time with {} slots: {}".format(nslots, e))
+                continue
+            if start is not None:
+                self._logger.info("expected start time with {} slots: {}".format(
+                    nslots, datetime.fromtimestamp(start).isoformat()
+                ))
+            # prefer more slots if they start at the same time
+            if start is not None and (best is None or start <= best[0]):
+                best = (start, nslots, pe_args)
+
+        if best is None:
+            self._logger.warning("failed to estimate start time. Use minimum slots: {}".format(
+                self._pe_candidates[0][0]
+            ))
+            pe_args = lower_args
+        else:
+            self._logger.warning("use {} slots which is expected to start earliest.".format(best[1]))
+            self.nslots, pe_args = best[1:]
+        self.args[wrapper_index:wrapper_index] = pe_args
+
+    def _map_mbind(self, mbind, binding):
+        if binding is None:
+            self._logger.warning("`-mbind` requires core binding by `-binding`.")
+
+        if mbind == "cores:strict":
+            return ["--mem-bind", "local"]
+        elif mbind in ("cores", "nlocal"):
+            self._logger.warning('`-mbind {}` is mapped to strict local memory binding.'.format(mbind))
+            return ["--mem-bind", "local"]
+        elif mbind == "round_robin":
+            self._logger.warning("`-mbind round_robin` (memory interleaving) is not supported.")
+            return []
+
+        raise UGE2slurmCommandError('unknown mbind parameter: "{}"'.format(mbind))
+
+    def _get_option_value(self, option):
+        for i, arg in enumerate(self.args[:-1]):
+            if arg == option:
+                return self.args[i + 1]
+
+    def _set_option_value(self, option, value):
+        for i, arg in enumerate(self.args[:-1]):
+            if arg == option:
+                self.args[i + 1] = value
+                return
+        self.args += [option, value]
+
+    def _rightsize(self):
+        mode = self._args.rightsize
+        if mode is None:
+            return
+
+        database = open_database()
+        if database is None:
+            self._logger.warning("rightsize: local accounting database is not found. "
+                                 "Run `uge2slurm acct sync` first.")
+            return
+        try:
+            history = database.get_history(self._get_username(), self._get_jobname(), self.script_hash)
+        finally:
+            database.close()
+
+        q = self._args.rightsize_percentile
+        memory, duration, samples = suggest_limits(
+            history, q, self._args.rightsize_headroom, self._args.rightsize_samples
+        )
+        if memory is None and duration is None:
+            self._logger.info("rightsize: not enough history to suggest limits ({} jobs).".format(samples))
+            return
+
+        reason = "p{:g} of {} jobs x {:g}".format(q, samples, self._args.rightsize_headroom)
+        if memory is not None:
+            megabytes = int(ceil(memory / 1024 ** 2))
+            self._adjust_limit("--mem-per-cpu", "{}M".format(megabytes), megabytes * 1024 ** 2,
+                               parse_memory, reason)
+        if duration is not None:
+            minutes = int(ceil(duration / 60.))
+            self._adjust_limit("--time", format_duration(minutes * 60), minutes * 60,
+                               parse_duration, reason)
+
+    def record_script(self, sbatch_stdout):
+        """Record the script hash of the submitted job for `--rightsize`."""
+        jobid = re.search(r"\d+", sbatch_stdout or '')
+        if not jobid or self.script_hash is None:
+            return
+        database = open_database(create=True)
+        try:
+            database.record_script(jobid.group(), self._get_username(), self._get_jobname(), self.script_hash)
+        finally:
+            database.close()
+
+    def _adjust_limit(self, option, value, amount, parser, reason):
+        current = self._get_option_value(option)
+        if current is not None and parser(current) is not None and parser(current) <= amount:
+            self._logger.info("rightsize: {} {} is already tight (suggested: {}).".format(option, current, value))
+            return
+
+        current = "default" if current is None else current
+        if self._args.rightsize == "apply":
+            self._set_option_value(option, value)
+            self._logger.warning("rightsize: {} {} -> {} ({})".format(option, current, value, reason))
+        else:
+            self._logger.warning("rightsize: suggest {} {} instead of {} ({})".format(option, value, current, reason))
+
     def _convert_envvars(self):
         envname2solver = {
             "SGE_O_HOME": self._get_home,
@@ -609,6 +1024,14 @@ class CommandMapper(CommandMapperBase):
             if val is not None:
                 self.env_vars[envname] = val
 
+        # read by the wrapper
+        if self._args.tmpdir is not None:
+            self.env_vars["UGE2SLURM_TMPDIR"] = self._args.tmpdir
+        if self._args.no_tmpdir:
+            self.env_vars["UGE2SLURM_NO_TMPDIR"] = "1"
+        if self._args.srun:
+            self.env_vars["UGE2SLURM_LAUNCHER"] = "srun"
+
     @classmethod
     def _get_home(cls):
         return str(cls._HOME)
@@ -652,20 +1075,22 @@ class CommandMapper(CommandMapperBase):
 
     @mapmethod('v', 'V')
     def _map_environ_vars(self, v, V):
-        export = []
-        if V is True:
-            export.append("ALL")
-
-        if v:
-            export += v
-
-        for _k, _v in self.env_vars.items():
-            export.append("{}={}".format(_k, _v))
-
-        if not export:
-            export.append("NONE")
-
-        return ["--export", ','.join(export)]
+        variables = {}
+        for kv in v or []:
+            if '=' in kv:
+                name, value = kv.split('=', 1)
+            else:
+                name, value = kv, os.environ.get(kv)
+                if value is None:
+                    self._logger.warning('environment variable "{}" given by `-v` is not set.'.format(kv))
+                    continue
+            variables[name] = value
+        variables.update(self.env_vars)
+
+        additional_args = ["--export", "ALL" if V is True else "NONE"]
+        if variables:
+            additional_args += ["--export-file", write_export_file(variables, self.dry_run)]
+        return additional_args
 
     def _set_wrapper(self):
         if not os.path.exists(self.WRAPPER_PATH):
@@ -705,5 +1130,37 @@ class CommandMapper(CommandMapperBase):
     def _set_script(self):
         if self._args.command:
             self.args += self._args.command
-        else:
+        elif self.jobscript_path is not None:
             self.args.append(self.jobscript_path)
+
+    def _pack_command(self):
+        """Pass the command line of a binary job by `--wrap` and a script from stdin via stdin."""
+        if self._args.keep_script:
+            return
+
+        if self._args.b:
+            wrapper, interpreter = self.args[self._command_index:self._command_index + 2]
+            command = ' '.join(self.args[self._command_index + 2:])
+            del self.args[self._command_index:]
+            self.args += ["--wrap", "{} {} -c {}".format(quote(wrapper), quote(interpreter), quote(command))]
+        elif self.jobscript_path is None:
+            launcher = ' '.join(quote(str(arg)) for arg in self.args[self._command_index:])
+            del self.args[self._command_index:]
+            self.batch_script = self._make_batch_script(launcher)
+            self._logger.info("the job script is passed to sbatch via stdin.")
+
+    def _make_batch_script(self, launcher):
+        delimiter = "UGE2SLURM_SCRIPT_EOF"
+        while delimiter in self.script:
+            delimiter += '_'
+        return '\n'.join((
+            "#!/bin/sh",
+            "# generated by uge2slurm: write the job script into node-local scratch and run it",
+            'script=$(mktemp "${UGE2SLURM_TMPDIR:-/tmp}/uge2slurm-script.XXXXXX") || exit 1',
+            "cat > \"$script\" << '{}'".format(delimiter),
+            self.script.rstrip('\n'),
+            delimiter,
+            'export UGE2SLURM_SCRIPT_TMP="$script"',
+            'exec {} "$script"'.format(launcher),
+            ''
+        ))
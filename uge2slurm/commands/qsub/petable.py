@@ -0,0 +1,91 @@
+import logging
+from fnmatch import fnmatchcase
+
+from uge2slurm.commands import UGE2slurmCommandError
+
+logger = logging.getLogger(__name__)
+
+PE_SLOTS = "$pe_slots"
+FILL_UP = "$fill_up"
+ROUND_ROBIN = "$round_robin"
+_RULES = (PE_SLOTS, FILL_UP, ROUND_ROBIN)
+
+
+def parse_allocation_rule(value):
+    """Return one of the rule constants or the fixed number of slots per host."""
+    rule = value.strip()
+    if rule.isdigit():
+        return int(rule)
+    if not rule.startswith('$'):
+        rule = '$' + rule
+    if rule not in _RULES:
+        raise UGE2slurmCommandError('unknown allocation rule: "{}"'.format(value))
+    return rule
+
+
+def load_pe_table(path):
+    """
+    Read `qconf -sp` outputs (concatenated outputs for multiple PEs are allowed)
+    and return a dict of PE names and allocation rules.
+    """
+    table = {}
+    pe_name = None
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split(None, 1)
+                if len(fields) != 2:
+                    continue
+                key, value = fields
+                if key == "pe_name":
+                    pe_name = value.strip()
+                elif key == "allocation_rule" and pe_name is not None:
+                    table[pe_name] = parse_allocation_rule(value)
+    except (IOError, OSError) as e:
+        raise UGE2slurmCommandError('failed to read PE table "{}": {}'.format(path, e))
+    return table
+
+
+class PETable(object):
+    """Allocation rules of parallel environments from `--pe-rule` and `--pe-table` options."""
+    def __init__(self, rules=(), paths=()):
+        self.rules = {}
+        for path in paths:
+            self.rules.update(load_pe_table(path))
+        for kv in rules:
+            if '=' not in kv:
+                raise UGE2slurmCommandError('invalid PE rule "{}": expect pe_name=allocation_rule'.format(kv))
+            k, v = kv.split('=', 1)
+            self.rules[k] = parse_allocation_rule(v)
+
+    def get(self, pe_name):
+        if pe_name in self.rules:
+            return self.rules[pe_name]
+
+        # `-pe` accepts wildcards
+        hits = sorted(name for name in self.rules if fnmatchcase(name, pe_name))
+        rules = set(self.rules[name] for name in hits)
+        if len(rules) > 1:
+            logger.warning('"{}" matches PEs with different allocation rules: {}. use "{}".'.format(
+                pe_name, ", ".join(hits), hits[0]
+            ))
+        if hits:
+            return self.rules[hits[0]]
+        return None
+
+
+def parse_slot_ranges(value):
+    """Parse `n[-m][,...]` into sorted (min, max) tuples. `max` is None for open ranges."""
+    ranges = []
+    for item in value.split(','):
+        if '-' in item:
+            lower, upper = item.split('-', 1)
+        else:
+            lower = upper = item
+        try:
+            lower = int(lower) if lower else 1
+            upper = int(upper) if upper else None
+        except ValueError:
+            raise UGE2slurmCommandError('invalid slot range: "{}"'.format(value))
+        ranges.append((max(lower, 1), upper))
+    return sorted(ranges)
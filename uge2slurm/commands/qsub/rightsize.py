@@ -0,0 +1,33 @@
+from uge2slurm.commands.qacct.efficiency import percentile
+
+# recent failures by these states mean the limits should not be tightened
+_MEMORY_FAILURES = ("OUT_OF_MEMORY", )
+_TIME_FAILURES = ("TIMEOUT", "DEADLINE")
+
+
+def suggest_limits(history, q, headroom, min_samples):
+    """
+    Suggest memory per cpu (bytes) and time limit (seconds) from the job
+    history by the `q`th percentile of MaxRSS and Elapsed multiplied by
+    `headroom`. None is returned for a value which cannot be suggested.
+    The number of completed jobs used for the suggestion is also returned.
+    """
+    states = set((record["state"] or '').split(' ', 1)[0] for record in history)
+    completed = [record for record in history if (record["state"] or '').startswith("COMPLETED")]
+
+    memory = None
+    if not states.intersection(_MEMORY_FAILURES):
+        usages = sorted(
+            float(record["maxrss"]) / (record["slots"] or 1)
+            for record in completed if record["maxrss"]
+        )
+        if len(usages) >= min_samples:
+            memory = percentile(usages, q) * headroom
+
+    duration = None
+    if not states.intersection(_TIME_FAILURES):
+        elapsed = sorted(record["wallclock"] for record in completed if record["wallclock"])
+        if len(elapsed) >= min_samples:
+            duration = percentile(elapsed, q) * headroom
+
+    return memory, duration, len(completed)
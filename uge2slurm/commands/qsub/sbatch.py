@@ -0,0 +1,17 @@
+import re
+
+from uge2slurm.utils.slurm import run_command
+from uge2slurm.utils.units import parse_datetime
+
+_EXPECTED_START = re.compile(r"to start at (\S+)")
+
+
+def get_expected_start(args, script=None):
+    """
+    Return the expected start time (UNIX time) of the job by `sbatch --test-only`.
+    `script` is passed via stdin if specified.
+    """
+    res = run_command("sbatch", ["--test-only"] + args, input=script)
+    match = _EXPECTED_START.search(res.stderr or '') or _EXPECTED_START.search(res.stdout or '')
+    if match:
+        return parse_datetime(match.group(1))
@@ -8,8 +8,9 @@ from uge2slurm.utils.path import get_command_paths
 from uge2slurm.utils.log import entrypoint
 from uge2slurm.utils.color import cprint
 
-from ..qsub import set_subperser
+from .. import qsub, qstat, qacct, qdel, qhold, qrls, qmod, qalter, qhost, qselect, qrsh, qlogin, qresub, qmake
 from ..argparser import get_top_parser
+from . import acct, logs
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +76,22 @@ def main():
     parser = get_top_parser()
 
     subparsers = parser.add_subparsers()
-    set_subperser("qsub", subparsers)
+    qsub.set_subperser("qsub", subparsers)
+    qstat.set_subperser("qstat", subparsers)
+    qacct.set_subperser("qacct", subparsers)
+    qdel.set_subperser("qdel", subparsers)
+    qhold.set_subperser("qhold", subparsers)
+    qrls.set_subperser("qrls", subparsers)
+    qmod.set_subperser("qmod", subparsers)
+    qalter.set_subperser("qalter", subparsers)
+    qhost.set_subperser("qhost", subparsers)
+    qselect.set_subperser("qselect", subparsers)
+    qrsh.set_subperser("qrsh", subparsers)
+    qlogin.set_subperser("qlogin", subparsers)
+    qresub.set_subperser("qresub", subparsers)
+    qmake.set_subperser("qmake", subparsers)
+    acct.set_subperser("acct", subparsers)
+    logs.set_subperser("logs", subparsers)
 
     args = None
     try:
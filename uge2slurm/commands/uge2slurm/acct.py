@@ -0,0 +1,63 @@
+from __future__ import print_function
+
+import time
+import logging
+
+from uge2slurm.commands.argparser import parse_ge_datetime
+from uge2slurm.utils.acctdb import open_database, sync
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+logger = logging.getLogger(__name__)
+
+
+def run_sync(args):
+    since = until = None
+    if args.since is not None:
+        since = int(time.mktime(args.since.timetuple()))
+    if args.until is not None:
+        until = int(time.mktime(args.until.timetuple()))
+
+    database = open_database(args.database, create=True)
+    try:
+        count = sync(database, since, until, slice_length=args.slice * 3600, workers=args.workers)
+    finally:
+        database.close()
+    print("{} records were synced.".format(count))
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(name, description="Manage local accounting database",
+                                   add_help=False, formatter_class=HelpFormatter)
+    parser.add_argument("-?", "--help", action="help",
+                        help="show this help message and exit")
+    commands = parser.add_subparsers()
+
+    sync_parser = commands.add_parser(
+        "sync", add_help=False, formatter_class=HelpFormatter,
+        description="Pull finished jobs from `sacct` into the local accounting database "
+                    "incrementally since the last sync."
+    )
+    sync_parser.add_argument("-?", "--help", action="help",
+                             help="show this help message and exit")
+    sync_parser.add_argument(
+        "--database", metavar="path",
+        help="Path to the local accounting database. Default is ~/.uge2slurm/acct.sqlite"
+    )
+    sync_parser.add_argument(
+        "--since", type=parse_ge_datetime, metavar="[[CC]YY]MMDDhhmm[.SS]",
+        help="Sync jobs finished after this time instead of the last synced time. "
+             "Required for the first sync."
+    )
+    sync_parser.add_argument(
+        "--until", type=parse_ge_datetime, metavar="[[CC]YY]MMDDhhmm[.SS]",
+        help="Sync jobs finished before this time. Default is now."
+    )
+    sync_parser.add_argument(
+        "--slice", type=int, default=24, metavar="hours",
+        help="Split the sync window into slices of this length. Default is 24."
+    )
+    sync_parser.add_argument(
+        "--workers", type=int, default=4, metavar="N",
+        help="Number of slices fetched in parallel. Default is 4."
+    )
+    sync_parser.set_defaults(func=run_sync)
@@ -0,0 +1,80 @@
+import os
+import sys
+import glob
+import logging
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.py2.argparse import HelpFormatter
+
+logger = logging.getLogger(__name__)
+
+_INDEX_SUFFIX = ".idx"
+_COPY_SIZE = 1024 * 1024
+
+
+def find_record(directories, jobid, task_id, stream='o'):
+    """
+    Search index files of aggregated logs written by `qsub --aggregate-logs`
+    and return (log file path, offset, length) of the last record of the task.
+    """
+    task_id = str(task_id)
+    pattern = "*.{}{}.*{}".format(stream, jobid, _INDEX_SUFFIX)
+
+    found = None
+    for directory in directories:
+        for index_path in glob.glob(os.path.join(directory, pattern)):
+            with open(index_path) as f:
+                for line in f:
+                    fields = line.split()
+                    # a requeued task appends a new record
+                    if len(fields) == 3 and fields[0] == task_id:
+                        found = (index_path[:-len(_INDEX_SUFFIX)], int(fields[1]), int(fields[2]))
+        if found is not None:
+            return found
+
+
+def copy_record(path, offset, length, output):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while length > 0:
+            chunk = f.read(min(length, _COPY_SIZE))
+            if not chunk:
+                raise UGE2slurmCommandError('log file "{}" is truncated.'.format(path))
+            output.write(chunk)
+            length -= len(chunk)
+
+
+def run_logs(args):
+    directories = args.dir or [os.getcwd(), os.path.expanduser('~')]
+    stream = 'e' if args.e else 'o'
+
+    record = find_record(directories, args.jobid, args.task, stream)
+    if record is None:
+        raise UGE2slurmCommandError("log of task {}.{} is not found in {}.".format(
+            args.jobid, args.task, ", ".join(directories)
+        ))
+
+    logger.info("{}: offset {}, length {}".format(*record))
+    output = getattr(sys.stdout, "buffer", sys.stdout)
+    copy_record(record[0], record[1], record[2], output)
+    output.flush()
+
+
+def set_subperser(name, subparsers):
+    parser = subparsers.add_parser(
+        name, add_help=False, formatter_class=HelpFormatter,
+        description="Extract the output of an array task from logs aggregated by "
+                    "`qsub --aggregate-logs`."
+    )
+    parser.add_argument("-?", "--help", action="help",
+                        help="show this help message and exit")
+    parser.add_argument("-e", action="store_true",
+                        help="Show the standard error instead of the standard output.")
+    parser.add_argument(
+        "--dir", action="append", metavar="path",
+        help="Directory to search logs. This option can be specified multiple "
+             "times. Default is the current and home directory."
+    )
+    parser.add_argument("jobid")
+    parser.add_argument("task", type=int)
+    parser.set_defaults(func=run_logs)
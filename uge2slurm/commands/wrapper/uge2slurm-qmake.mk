@@ -0,0 +1,8 @@
+# Read by qmake after the makefiles. Recipes are run by uge2slurm-qmakeshell.sh
+# as job steps with the shell of the makefiles, while `$(shell ...)` functions
+# expanded at parse time keep running on the current host by the original shell.
+#
+# This file is a part of "uge2slurm" python package.
+
+export UGE2SLURM_QMAKE_SHELL := $(SHELL)
+%: SHELL = $(dir $(lastword $(MAKEFILE_LIST)))uge2slurm-qmakeshell.sh
@@ -0,0 +1,16 @@
+#!/bin/sh
+#
+# SHELL of make recipes for qmake (set by uge2slurm-qmake.mk). make runs each
+# recipe by `$(SHELL) $(.SHELLFLAGS) recipe` and this script launches it by srun
+# as a job step of the allocation (or as a lightweight job) with the original
+# shell of the makefiles in UGE2SLURM_QMAKE_SHELL. qmake gives the srun command
+# line in UGE2SLURM_QMAKE_SRUN as a shell-quoted string.
+#
+# This script is a part of "uge2slurm" python package.
+
+if [ -z "$UGE2SLURM_QMAKE_SRUN" ]; then
+    echo "$0: UGE2SLURM_QMAKE_SRUN is not set. Run make by qmake." >&2
+    exit 1
+fi
+
+eval "exec $UGE2SLURM_QMAKE_SRUN \"\${UGE2SLURM_QMAKE_SHELL:-/bin/sh}\" \"\$@\""
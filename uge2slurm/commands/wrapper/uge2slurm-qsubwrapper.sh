@@ -1,16 +1,5 @@
-#!/bin/sh
-
-SLURM_ENV_NAMES=(
-    "SLURM_ARRAY_TASK_ID"
-    "SLURM_ARRAY_TASK_MIN"
-    "SLURM_ARRAY_TASK_MAX"
-    "SLURM_ARRAY_TASK_STEP"
-    "SLURMD_NODENAME"
-    "SLURM_JOB_ID"
-    "SLURM_JOB_NAME"
-    "SLURM_CPUS_PER_TASK"
-    "SLURM_JOB_PARTITION"
-)
+#!/bin/bash
+
 UGE_ENV_NAMES=(
     "SGE_TASK_ID"
     "SGE_TASK_FIRST"
@@ -20,7 +9,13 @@ UGE_ENV_NAMES=(
     "JOB_ID"
     "JOB_NAME"
     "NSLOTS"
+    "NHOSTS"
     "QUEUE"
+    "SGE_CWD_PATH"
+    "RESTARTED"
+    "TMPDIR"
+    "TMP"
+    "SGE_STDIN_PATH"
 )
 
 
@@ -29,10 +24,13 @@ if [ ${#@} -eq 0 ]; then
     echo "Convert Slurm environment variables to UGE variables"
     echo
     echo "Supported UGE variables are:"
-    for v in "${UGE_ENV_NAMES[@]}" SGE_CWD_PATH RESTARTED; do
+    for v in "${UGE_ENV_NAMES[@]}"; do
         echo "    $v"
     done
     echo
+    echo "The command is executed in the batch step by default. Set"
+    echo "UGE2SLURM_LAUNCHER=srun to launch it by srun as a job step."
+    echo
     echo 'This script is a part of "uge2slurm" python package.'
     echo
 
@@ -40,25 +38,29 @@ if [ ${#@} -eq 0 ]; then
 fi
 
 
-for i in $(seq 0 $((${#SLURM_ENV_NAMES[@]} - 1))); do
-    if [ -z "${SLURM_ENV_NAMES[$i]+x}" ] || [ -z "${UGE_ENV_NAMES[$i]+x}" ]; then
-        break
-    fi
-
-    env_from="${SLURM_ENV_NAMES[$i]+x}"
-    env_to="${UGE_ENV_NAMES[$i]+x}"
-    export "${env_from}=${env_to}"
-done
-
-# SGE_CWD_PATH
-if command -v pwd > /dev/null; then
-    export SGE_CWD_PATH=$(pwd)
+# UGE variables are derived in a single pass without subshells
+if [ "${SLURM_ARRAY_TASK_ID}" ]; then
+    export SGE_TASK_ID="${SLURM_ARRAY_TASK_ID}"
+    export SGE_TASK_FIRST="${SLURM_ARRAY_TASK_MIN}"
+    export SGE_TASK_LAST="${SLURM_ARRAY_TASK_MAX}"
+    export SGE_TASK_STEPSIZE="${SLURM_ARRAY_TASK_STEP:-1}"
+    export JOB_ID="${SLURM_ARRAY_JOB_ID}"
+else
+    export SGE_TASK_ID=undefined
+    export SGE_TASK_FIRST=undefined
+    export SGE_TASK_LAST=undefined
+    export SGE_TASK_STEPSIZE=undefined
+    export JOB_ID="${SLURM_JOB_ID}"
 fi
+export HOSTNAME="${SLURMD_NODENAME:-$HOSTNAME}"
+export JOB_NAME="${SLURM_JOB_NAME}"
+export NSLOTS=$(( ${SLURM_NTASKS:-1} * ${SLURM_CPUS_PER_TASK:-1} ))
+export NHOSTS="${SLURM_JOB_NUM_NODES:-1}"
+export QUEUE="${SLURM_JOB_PARTITION}"
+export SGE_CWD_PATH="${PWD}"
 
 # TODO: SGE_STDERR_PATH
 # TODO: SGE_STDOUT_PATH
-# TODO: SGE_STDIN_PATH
-# TODO: NHOSTS
 # TODO: NQUEUES
 
 # RESTARTED
@@ -70,5 +72,247 @@ if [ "${SLURM_RESTART_COUNT}" ]; then
     fi
 fi
 
-#
-srun "$@"
+# TMPDIR
+# create a private directory on the node-local scratch like UGE
+# (<tmpdir>/<job_id>.<task_id>.<queue>). the job holds a shared lock on
+# `<dir>/.uge2slurm.lock` while it runs, even after this script replaces itself
+# with the command. the directory is removed at exit if this script waits for the
+# command, and otherwise by the next job of the user on the node which finds it
+# unlocked. UGE2SLURM_NO_TMPDIR (qsub --no-tmpdir) disables it, e.g. for clusters
+# which provide per-job TMPDIR by themselves.
+tmpdir_root="${UGE2SLURM_TMPDIR:-/tmp}"
+tmpdir=
+
+evict_tmpdirs() {
+    local lock
+    for lock in "${tmpdir_root}"/*/.uge2slurm.lock; do
+        [ -O "$lock" ] || continue
+        (
+            flock -n -x 9 || exit
+            rm -rf "${lock%/.uge2slurm.lock}"
+        ) 9< "$lock"
+    done
+}
+
+make_tmpdir() {
+    local dir=$1 fd
+    while true; do
+        mkdir -m 700 -p "$dir" && exec {fd}>> "${dir}/.uge2slurm.lock" || return 1
+        flock -s "$fd" || return 1
+        # retry if the directory was evicted while waiting for the lock
+        [ "$(stat -c %i "${dir}/.uge2slurm.lock" 2> /dev/null)" = "$(stat -L -c %i "/proc/$$/fd/$fd")" ] && break
+        exec {fd}>&-
+    done
+}
+
+if [ "${SLURM_JOB_ID}" ] && [ -z "${UGE2SLURM_NO_TMPDIR}" ]; then
+    evict_tmpdirs
+    tmpdir="${tmpdir_root}/${SLURM_JOB_ID}.${SLURM_ARRAY_TASK_ID:-undefined}.${SLURM_JOB_PARTITION}"
+    if make_tmpdir "$tmpdir"; then
+        export TMPDIR="$tmpdir"
+        export TMP="$tmpdir"
+    else
+        echo "uge2slurm: failed to create TMPDIR: $tmpdir" >&2
+        tmpdir=
+    fi
+fi
+
+# stage-in
+# files listed in UGE2SLURM_STAGE_IN (separated by ':') are copied into the
+# node-local scratch once per node and arguments which match them are rewritten.
+# the cache is keyed by sha1 of path, size and mtime and shared by jobs on the
+# node. jobs hold a shared lock on `<copy>.lock` while they run, and copies
+# which are not locked and not used for UGE2SLURM_STAGE_TTL seconds are evicted.
+# multi-node jobs broadcast per-job copies by sbcast instead.
+stage_root="${UGE2SLURM_TMPDIR:-/tmp}"
+stage_ttl="${UGE2SLURM_STAGE_TTL:-86400}"
+broadcasted=()
+
+evict_stage() {
+    local lock now
+    now=$(date +%s)
+    for lock in "${stage_root}/uge2slurm-stage.${USER}".*.lock; do
+        [ -e "$lock" ] || continue
+        [ $(( now - $(stat -c %Y "$lock" 2> /dev/null || echo "$now") )) -gt "$stage_ttl" ] || continue
+        (
+            flock -n -x 9 || exit
+            rm -f "${lock%.lock}" "$lock"
+        ) 9< "$lock"
+    done
+}
+
+# set the staged path to `stage_dst`
+stage_file() {
+    local src=$1 dst key fd
+    key=$(printf '%s %s' "$src" "$(stat -L -c '%s.%Y' "$src")" | sha1sum)
+    if [ "${SLURM_JOB_NUM_NODES:-1}" -gt 1 ]; then
+        dst="${stage_root}/uge2slurm-stage.${SLURM_JOB_ID}.${#broadcasted[@]}.${src##*/}"
+        sbcast --force --preserve "$src" "$dst" > /dev/null || return 1
+        broadcasted+=("$dst")
+    else
+        dst="${stage_root}/uge2slurm-stage.${USER}.${key%% *}.${src##*/}"
+        while true; do
+            exec {fd}>> "${dst}.lock" || return 1
+            flock -x "$fd" || return 1
+            # retry if the lock file was evicted while waiting for the lock
+            [ "$(stat -c %i "${dst}.lock" 2> /dev/null)" = "$(stat -L -c %i "/proc/$$/fd/$fd")" ] && break
+            exec {fd}>&-
+        done
+        if [ ! -e "$dst" ]; then
+            if ! { cp -p "$src" "${dst}.$$" && mv "${dst}.$$" "$dst"; }; then
+                rm -f "${dst}.$$"
+                exec {fd}>&-
+                return 1
+            fi
+        fi
+        touch "${dst}.lock"
+        # the shared lock is kept until the job exits
+        flock -s "$fd"
+    fi
+    stage_dst="$dst"
+}
+
+if [ "${UGE2SLURM_STAGE_IN}" ]; then
+    declare -A staged
+    evict_stage
+    IFS=: read -r -a stage_paths <<< "${UGE2SLURM_STAGE_IN}"
+    for src in "${stage_paths[@]}"; do
+        if stage_file "$src"; then
+            staged["$src"]="$stage_dst"
+        else
+            echo "uge2slurm: failed to stage $src. use it directly." >&2
+        fi
+    done
+
+    args=()
+    for arg in "$@"; do
+        if [ "$arg" ] && [ "${staged[$arg]+x}" ]; then
+            args+=("${staged[$arg]}")
+        else
+            args+=("$arg")
+        fi
+    done
+    set -- "${args[@]}"
+
+    if [ "${UGE2SLURM_STAGE_STDIN}" ]; then
+        export SGE_STDIN_PATH="${staged[${UGE2SLURM_STAGE_STDIN}]:-${UGE2SLURM_STAGE_STDIN}}"
+        exec < "${SGE_STDIN_PATH}"
+    fi
+fi
+
+# aggregated logs
+# outputs of an array task are captured on the node and appended into a shared
+# chunk file at the end. `<chunk file>.idx` records `<task_id> <offset> <length>`.
+logfile_o=
+logfile_e=
+if [ "${UGE2SLURM_LOG_CHUNK}" ] && [ "${SLURM_ARRAY_TASK_ID}" ]; then
+    if [ "${UGE2SLURM_LOG_CHUNK}" = "node" ]; then
+        chunk="${SLURMD_NODENAME}"
+    else
+        chunk=$(( SLURM_ARRAY_TASK_ID / UGE2SLURM_LOG_CHUNK ))
+    fi
+    # outside of the private TMPDIR which is removed at exit before the
+    # captures are kept on a failure of appending
+    capture_dir="${UGE2SLURM_TMPDIR:-/tmp}"
+
+    logfile_o="${UGE2SLURM_LOG_O_DIR}/${SLURM_JOB_NAME}.o${SLURM_ARRAY_JOB_ID}.${chunk}"
+    capture_o=$(mktemp "${capture_dir}/.uge2slurm.o.XXXXXX")
+    if [ "${UGE2SLURM_LOG_E_DIR}" ]; then
+        logfile_e="${UGE2SLURM_LOG_E_DIR}/${SLURM_JOB_NAME}.e${SLURM_ARRAY_JOB_ID}.${chunk}"
+        capture_e=$(mktemp "${capture_dir}/.uge2slurm.e.XXXXXX")
+    fi
+
+    # keep the original outputs for messages from this script
+    exec 3>&1 4>&2
+    exec > "$capture_o"
+    if [ "$logfile_e" ]; then
+        exec 2> "$capture_e"
+    else
+        exec 2>&1
+    fi
+fi
+
+append_log() {
+    local capture=$1 logfile=$2
+    (
+        flock 9 || exit 1
+        offset=$(stat -c %s "$logfile" 2> /dev/null || echo 0)
+        cat "$capture" >> "$logfile" || exit 1
+        echo "${SLURM_ARRAY_TASK_ID} ${offset} $(stat -c %s "$capture")" >&9
+    ) 9>> "${logfile}.idx" && rm -f "$capture" && return
+
+    # move the output next to the log not to lose it with the node-local scratch
+    local kept="${logfile}.${SLURM_ARRAY_TASK_ID}"
+    if mv "$capture" "$kept" 2> /dev/null; then
+        echo "uge2slurm: failed to append log: $logfile (kept in $kept)" >&2
+    else
+        echo "uge2slurm: failed to append log: $logfile (kept in $capture on ${SLURMD_NODENAME:-$HOSTNAME})" >&2
+    fi
+}
+
+cleanup() {
+    if [ "$logfile_o" ]; then
+        exec 1>&3 2>&4
+        append_log "$capture_o" "$logfile_o"
+        [ "$logfile_e" ] && append_log "$capture_e" "$logfile_e"
+    fi
+    [ "$tmpdir" ] && rm -rf "$tmpdir"
+    # the job script written by the script given to sbatch via stdin
+    [ "$script_tmp" ] && rm -f "$script_tmp"
+    if [ ${#broadcasted[@]} -gt 0 ]; then
+        srun --ntasks="${SLURM_JOB_NUM_NODES}" --ntasks-per-node=1 --cpus-per-task=1 --overlap \
+            rm -f "${broadcasted[@]}"
+    fi
+}
+
+# settings for this script are not passed to the command, whose `qsub -V`
+# would give them to the child job
+launcher="${UGE2SLURM_LAUNCHER}"
+script_tmp="${UGE2SLURM_SCRIPT_TMP}"
+unset UGE2SLURM_LAUNCHER UGE2SLURM_SCRIPT_TMP UGE2SLURM_TMPDIR UGE2SLURM_NO_TMPDIR \
+    UGE2SLURM_STAGE_IN UGE2SLURM_STAGE_STDIN UGE2SLURM_LOG_CHUNK UGE2SLURM_LOG_O_DIR UGE2SLURM_LOG_E_DIR
+
+# the job script written from stdin is removed with the private TMPDIR
+if [ "$script_tmp" ] && [ "$tmpdir" ] && mv "$script_tmp" "${tmpdir}/.uge2slurm-script" 2> /dev/null; then
+    args=()
+    for arg in "$@"; do
+        [ "$arg" = "$script_tmp" ] && arg="${tmpdir}/.uge2slurm-script"
+        args+=("$arg")
+    done
+    set -- "${args[@]}"
+    script_tmp=
+fi
+
+# nothing to do at exit: replace this shell with the command. the private
+# TMPDIR is left to `evict_tmpdirs` of a later job.
+if [ -z "$logfile_o" ] && [ ${#broadcasted[@]} -eq 0 ] &&
+        [ -z "$script_tmp" ] && [ "$launcher" != "srun" ]; then
+    exec "$@"
+fi
+
+trap cleanup EXIT
+
+if [ "$launcher" = "srun" ]; then
+    # the job script runs once like UGE even if the job has multiple tasks
+    # (-pe fill_up, round_robin). other steps launched by the script may
+    # share the resources of this step. srun does not inherit --cpus-per-task
+    # of the job since Slurm 22.05.
+    srun --nodes=1 --ntasks=1 --cpus-per-task="${SLURM_CPUS_PER_TASK:-1}" --overlap "$@"
+    exit $?
+fi
+
+# keep the shell to clean up and forward signals to the command
+# (`--signal B:...` and `scancel --batch` only signal this shell). background
+# commands of a non-interactive shell ignore SIGINT and SIGQUIT, which are
+# restored in the subshell before exec.
+( trap - INT QUIT; exec "$@" ) <&0 3>&- 4>&- &
+child=$!
+for signal in HUP INT TERM USR1 USR2; do
+    trap "kill -s $signal $child 2> /dev/null" $signal
+done
+
+# `wait` returns when it is interrupted by a trapped signal
+while kill -0 $child 2> /dev/null; do
+    wait $child
+done
+wait $child
@@ -0,0 +1,205 @@
+import os
+import time
+import sqlite3
+import logging
+from multiprocessing.pool import ThreadPool
+
+from uge2slurm.commands import UGE2slurmCommandError
+from uge2slurm.utils.path import DATA_DIR, get_data_path
+from uge2slurm.utils.sacct import RECORD_KEYS, FINISHED_STATES, iter_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE = "acct.sqlite"
+# records which end just before the sync may not have been stored in slurmdbd yet
+SYNC_LAG = 300
+
+_NO_TASK = -1
+_COLUMNS = ', '.join('"{}"'.format(key) for key in RECORD_KEYS)
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ({}, PRIMARY KEY (jobid, taskid))".format(_COLUMNS),
+    'CREATE INDEX IF NOT EXISTS jobs_end ON jobs ("end")',
+    "CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, \"end\")",
+    "CREATE INDEX IF NOT EXISTS jobs_account ON jobs (account, \"end\")",
+    "CREATE INDEX IF NOT EXISTS jobs_jobname ON jobs (jobname, \"end\")",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+    "CREATE TABLE IF NOT EXISTS scripts (jobid TEXT PRIMARY KEY, owner, jobname, script_hash, submit INTEGER)",
+    "CREATE INDEX IF NOT EXISTS scripts_hash ON scripts (owner, script_hash)"
+)
+
+
+def get_database_path(path=None, create=False):
+    """Return the database path. The data directory is created only if `create` is True."""
+    if path is None:
+        path = get_data_path(DEFAULT_DATABASE) if create else os.path.join(DATA_DIR, DEFAULT_DATABASE)
+    return path
+
+
+class AccountingDatabase(object):
+    """Local store of finished job records synced from `sacct`."""
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        for statement in _SCHEMA:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def get_coverage(self):
+        """Return (begin, end) of the time range whose finished jobs are all stored."""
+        rows = dict(self.connection.execute(
+            "SELECT key, value FROM meta WHERE key IN ('lowmark', 'watermark')"
+        ))
+        if "lowmark" not in rows or "watermark" not in rows:
+            return None
+        return rows["lowmark"], rows["watermark"]
+
+    def set_coverage(self, begin, end):
+        self.connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                    (("lowmark", begin), ("watermark", end)))
+
+    def insert(self, records):
+        rows = []
+        for record in records:
+            row = tuple(record[key] for key in RECORD_KEYS)
+            if record["taskid"] is None:
+                row = row[:-1] + (_NO_TASK, )
+            rows.append(row)
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO jobs ({}) VALUES ({})".format(
+                _COLUMNS, ', '.join('?' for _ in RECORD_KEYS)
+            ),
+            rows
+        )
+        return len(rows)
+
+    def commit(self):
+        self.connection.commit()
+
+    def iter_records(self, begin=None, end=None, before=None, equals=None, globs=None):
+        """
+        Yield records whose start time is in [`begin`, `end`] and which have
+        finished before `before`. `equals` and `globs` are dicts of record keys
+        and values to filter records.
+        """
+        conditions = []
+        params = []
+        for key, op, value in (("start", ">=", begin), ("start", "<=", end), ("end", "<", before)):
+            if value is not None:
+                conditions.append('"{}" {} ?'.format(key, op))
+                params.append(value)
+        for op, filters in (('=', equals), ("GLOB", globs)):
+            for key, value in (filters or {}).items():
+                conditions.append('"{}" {} ?'.format(key, op))
+                params.append(value)
+
+        query = "SELECT {} FROM jobs".format(_COLUMNS)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += ' ORDER BY "end"'
+
+        for row in self.connection.execute(query, params):
+            record = dict(zip(RECORD_KEYS, row))
+            if record["taskid"] == _NO_TASK:
+                record["taskid"] = None
+            yield record
+
+    def record_script(self, jobid, owner, jobname, script_hash):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO scripts (jobid, owner, jobname, script_hash, submit) VALUES (?, ?, ?, ?, ?)",
+            (jobid, owner, jobname, script_hash, int(time.time()))
+        )
+        self.connection.commit()
+
+    def get_history(self, owner, jobname, script_hash, limit=50):
+        """
+        Return recent records of the owner's jobs submitted with the same script,
+        or with the same job name if the script has never been recorded.
+        """
+        query = ("SELECT {} FROM jobs JOIN scripts USING (jobid) "
+                 "WHERE scripts.owner = ? AND script_hash = ? "
+                 'ORDER BY "end" DESC LIMIT ?').format(
+                     ', '.join("jobs.{}".format(column) for column in _COLUMNS.split(", ")))
+        rows = self.connection.execute(query, (owner, script_hash, limit)).fetchall()
+        if not rows:
+            query = ('SELECT {} FROM jobs WHERE owner = ? AND jobname = ? '
+                     'ORDER BY "end" DESC LIMIT ?').format(_COLUMNS)
+            rows = self.connection.execute(query, (owner, jobname, limit)).fetchall()
+
+        return [dict(zip(RECORD_KEYS, row)) for row in rows]
+
+
+def open_database(path=None, create=False):
+    """Return `AccountingDatabase` or None if it does not exist and `create` is False."""
+    try:
+        path = get_database_path(path, create)
+        if not create:
+            with open(path, "rb"):
+                pass
+        return AccountingDatabase(path)
+    except (IOError, OSError, sqlite3.Error) as e:
+        if create:
+            raise UGE2slurmCommandError("failed to open database: {}".format(e))
+        return None
+
+
+def _format_time(value):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(value))
+
+
+def _fetch_slice(time_slice):
+    begin, end = time_slice
+    args = ["--allusers",
+            "--starttime", _format_time(begin),
+            "--endtime", _format_time(end),
+            "--state", ','.join(FINISHED_STATES)]
+    return time_slice, [
+        record for record in iter_records(args)
+        if record["end"] is not None and begin <= record["end"] < end
+    ]
+
+
+def sync(database, since=None, until=None, slice_length=86400, workers=4):
+    """
+    Pull records finished in [since, until) into the database. `since` defaults
+    to the last synced time (watermark). The window is split into slices fetched
+    in parallel and the watermark is moved forward slice by slice so that an
+    interrupted sync can be resumed.
+    """
+    coverage = database.get_coverage()
+    if since is None:
+        if coverage is None:
+            raise UGE2slurmCommandError("the database has never been synced. specify start time.")
+        since = coverage[1]
+    if until is None:
+        until = int(time.time()) - SYNC_LAG
+
+    slices = []
+    begin = since
+    while begin < until:
+        slices.append((begin, min(begin + slice_length, until)))
+        begin += slice_length
+
+    total = 0
+    pool = ThreadPool(max(1, min(workers, len(slices))))
+    try:
+        # `imap` returns slices in order so that the coverage grows without gaps
+        for (begin, end), records in pool.imap(_fetch_slice, slices):
+            count = database.insert(records)
+            if coverage is None:
+                coverage = (begin, end)
+            elif begin <= coverage[1] and end >= coverage[0]:
+                coverage = (min(begin, coverage[0]), max(end, coverage[1]))
+            else:
+                logger.warning("synced window is not contiguous with the previous sync.")
+            database.set_coverage(*coverage)
+            database.commit()
+            total += count
+            logger.info("synced {} records: {} - {}".format(count, _format_time(begin), _format_time(end)))
+    finally:
+        pool.terminate()
+
+    return total
@@ -0,0 +1,113 @@
+import re
+from collections import OrderedDict
+
+from uge2slurm.utils.ranges import compress_ranges
+
+_NUMBERED_HOST = re.compile(r"^(.*?)(\d+)(\D*)$")
+_BRACKET = re.compile(r"\[([^\]]*)\]")
+
+
+def _split_top_level(hostlist):
+    """Split a hostlist by commas outside of brackets."""
+    items = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(hostlist):
+        if c == '[':
+            depth += 1
+        elif c == ']':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            items.append(hostlist[start:i])
+            start = i + 1
+    items.append(hostlist[start:])
+    return [item for item in items if item]
+
+
+def _expand_range(value):
+    names = []
+    for item in value.split(','):
+        if '-' in item:
+            first, last = item.split('-', 1)
+            width = len(first) if first.startswith('0') else 0
+            names += ["{:0{}d}".format(n, width) for n in range(int(first), int(last) + 1)]
+        elif item:
+            names.append(item)
+    return names
+
+
+def expand_hostlist(hostlist):
+    """Expand Slurm hostlist expression like `node[01-03,05],gpu1` into host names."""
+    hosts = []
+    for item in _split_top_level(hostlist):
+        match = _BRACKET.search(item)
+        if match is None:
+            hosts.append(item)
+            continue
+        head, tail = item[:match.start()], item[match.end():]
+        # a tail can have more brackets like `rack[1-2]-node[01-04]`
+        tails = expand_hostlist(tail) if '[' in tail else [tail]
+        for name in _expand_range(match.group(1)):
+            hosts += [head + name + t for t in tails]
+    return hosts
+
+
+def compress_hostlist(hosts):
+    """
+    Compress host names into Slurm hostlist expression like `node[001-200]`.
+    Hosts are grouped by the prefix, zero padding and suffix of their last number.
+    """
+    groups = OrderedDict()
+    for host in hosts:
+        match = _NUMBERED_HOST.match(host)
+        if match is None or '[' in host:
+            groups.setdefault((host, None, None), None)
+            continue
+        prefix, digits, suffix = match.groups()
+        width = len(digits) if digits.startswith('0') and len(digits) > 1 else 0
+        groups.setdefault((prefix, width, suffix), []).append(int(digits))
+
+    # unpadded numbers which are not shorter than the padding join the padded group
+    # (e.g. `node099` and `node100` into `node[099-100]`)
+    for prefix, width, suffix in [key for key in groups if key[1] == 0]:
+        widths = sorted(w for p, w, s in groups if (p, s) == (prefix, suffix) and w)
+        if not widths:
+            continue
+        rest = []
+        for number in groups[(prefix, 0, suffix)]:
+            fits = [w for w in widths if len(str(number)) >= w]
+            if fits:
+                groups[(prefix, fits[-1], suffix)].append(number)
+            else:
+                rest.append(number)
+        if rest:
+            groups[(prefix, 0, suffix)] = rest
+        else:
+            del groups[(prefix, 0, suffix)]
+
+    items = []
+    for (prefix, width, suffix), numbers in groups.items():
+        if numbers is None:
+            items.append(prefix)
+            continue
+        ranges = [
+            "{:0{w}d}".format(first, w=width) if first == last else
+            "{:0{w}d}-{:0{w}d}".format(first, last, w=width)
+            for first, last, _ in compress_ranges(numbers, use_step=False)
+        ]
+        if len(ranges) == 1 and '-' not in ranges[0]:
+            items.append(prefix + ranges[0] + suffix)
+        else:
+            items.append("{}[{}]{}".format(prefix, ','.join(ranges), suffix))
+    return ','.join(items)
+
+
+def get_first_host(hostlist):
+    """Return the first host of a hostlist expression without expanding the rest."""
+    item = _split_top_level(hostlist)[0] if hostlist else ''
+    while True:
+        match = _BRACKET.search(item)
+        if match is None:
+            return item
+        first = match.group(1).split(',', 1)[0].split('-', 1)[0]
+        item = item[:match.start()] + first + item[match.end():]
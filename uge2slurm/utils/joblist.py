@@ -0,0 +1,124 @@
+from fnmatch import fnmatchcase
+from collections import OrderedDict
+
+from uge2slurm.utils.squeue import iter_jobs
+from uge2slurm.utils.ranges import parse_task_ranges, compress_ranges
+
+# keep each command line far below ARG_MAX, which is shared with the environment
+ARGV_LIMIT = 64 * 1024
+
+
+def get_user_args(users):
+    """`squeue` arguments for UGE user lists. None is the current user and `*` is all users."""
+    if users is None:
+        return ["--me"]
+    elif '*' in users:
+        return []
+    return ["--user", ','.join(users)]
+
+
+class JobSnapshot(object):
+    """
+    Jobs listed by a single `squeue` call. The listing is taken at the first
+    lookup and shared by all of the following name and user lookups.
+    `users` is None for the current user and may contain `*` for all users.
+    """
+    def __init__(self, users=None):
+        self.users = users
+        self._jobs = None
+
+    @property
+    def jobs(self):
+        """OrderedDict of job ids and (name, user) tuples. Array tasks are merged."""
+        if self._jobs is None:
+            self._jobs = OrderedDict()
+            for job in iter_jobs(get_user_args(self.users)):
+                self._jobs.setdefault(job.array_job_id, (job.name, job.user))
+        return self._jobs
+
+    def __contains__(self, job_id):
+        return job_id in self.jobs
+
+    def match(self, pattern):
+        """Return ids of jobs whose names match the UGE wildcard pattern."""
+        return [job_id for job_id, (name, _) in self.jobs.items() if fnmatchcase(name, pattern)]
+
+
+def _merge_tasks(jobs, job_id, tasks):
+    if job_id in jobs and jobs[job_id] is None:
+        return
+    if tasks is None:
+        jobs[job_id] = None
+    else:
+        jobs.setdefault(job_id, set()).update(tasks)
+
+
+def resolve_job_list(job_list, tasks=None, users=None, snapshot=None):
+    """
+    Resolve UGE job lists (ids, `id.task_range`, names and wildcards) into an
+    OrderedDict of job ids and task id sets (None for whole jobs). `squeue` is
+    called only if names or `users` have to be looked up.
+    Return the dict and the list of items which matched no jobs.
+    """
+    if snapshot is None:
+        snapshot = JobSnapshot(users)
+    if tasks is not None:
+        tasks = parse_task_ranges(tasks)
+
+    jobs = OrderedDict()
+    missing = []
+    if not job_list:
+        # `-u` without a job list selects all jobs of the users
+        for job_id in snapshot.jobs:
+            _merge_tasks(jobs, job_id, tasks)
+        return jobs, missing
+
+    for item in job_list:
+        job_id, _, task_range = item.partition('.')
+        if job_id.isdigit():
+            if users is not None and job_id not in snapshot:
+                missing.append(item)
+                continue
+            _merge_tasks(jobs, job_id, parse_task_ranges(task_range) if task_range else tasks)
+            continue
+
+        job_ids = snapshot.match(item)
+        if not job_ids:
+            missing.append(item)
+        for job_id in job_ids:
+            _merge_tasks(jobs, job_id, tasks)
+
+    return jobs, missing
+
+
+def format_task_ranges(tasks):
+    """Format task ids into Slurm `1-5,7` notation."""
+    return ','.join(
+        str(first) if first == last else "{}-{}".format(first, last)
+        for first, last, _ in compress_ranges(tasks, use_step=False)
+    )
+
+
+def format_job_id(job_id, tasks=None):
+    """Format a job id with array tasks into Slurm `id_[1-5,7]` notation."""
+    if tasks is None:
+        return job_id
+    ranges = format_task_ranges(tasks)
+    if ',' not in ranges and '-' not in ranges:
+        return "{}_{}".format(job_id, ranges)
+    return "{}_[{}]".format(job_id, ranges)
+
+
+def chunk_arguments(args, limit=ARGV_LIMIT):
+    """Split arguments into lists whose total length is within `limit`."""
+    chunk = []
+    size = 0
+    for arg in args:
+        if chunk and size + len(arg) + 1 > limit:
+            yield chunk
+            chunk = []
+            size = 0
+        chunk.append(arg)
+        size += len(arg) + 1
+    if chunk:
+        yield chunk
@@ -0,0 +1,28 @@
+import sys
+
+
+class ChunkedWriter(object):
+    """
+    Buffer small writes and flush them to the stream every `chunk_size` writes.
+    """
+    def __init__(self, stream=None, chunk_size=1024):
+        self.stream = sys.stdout if stream is None else stream
+        self.chunk_size = chunk_size
+        self._buffer = []
+
+    def write(self, text):
+        self._buffer.append(text)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self._buffer = []
+        self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, value, traceback):
+        self.flush()
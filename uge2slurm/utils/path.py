@@ -11,6 +11,7 @@ logger = logging.getLogger(__name__)
 _WIN_DEFAULT_PATHEXT = ".COM;.EXE;.BAT;.CMD;.VBS;.JS;.WS;.MSC"
 
 BIN_DIRECTORY = os.path.dirname(inspect.stack()[-1][1])
+DATA_DIR = os.environ.get("UGE2SLURM_DATA_DIR", os.path.join(os.path.expanduser('~'), ".uge2slurm"))
 
 
 def _get_command_paths(cmd, mode=os.F_OK | os.X_OK):
@@ -95,3 +96,12 @@ def get_command_path(cmd, verbose=False):
         return candidates[0]
     else:
         return None
+
+
+def get_data_path(*names):
+    """Get a path under the uge2slurm local data directory and create its parent."""
+    path = os.path.join(DATA_DIR, *names)
+    dirname = os.path.dirname(path)
+    if not os.path.isdir(dirname):
+        os.makedirs(dirname)
+    return path
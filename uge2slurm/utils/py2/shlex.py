@@ -0,0 +1,7 @@
+from __future__ import absolute_import
+
+
+try:
+    from shlex import quote  # novermin
+except ImportError:
+    from pipes import quote  # noqa
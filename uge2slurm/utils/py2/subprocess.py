@@ -53,7 +53,7 @@ except ImportError:
                 self.wait()
 
     def run(*popenargs, **kwargs):
-        input = None if "input" not in kwargs else kwargs["input"]
+        input = None if "input" not in kwargs else kwargs.pop("input")
         check = False if "check" not in kwargs else kwargs.pop("check")
 
         if input is not None:
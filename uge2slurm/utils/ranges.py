@@ -0,0 +1,57 @@
+def parse_task_ranges(value):
+    """
+    Expand task id specification like `1-10:2,15` (UGE) or `1-9:2,15%3` (Slurm)
+    into a list of integers.
+    """
+    value = value.split('%', 1)[0]
+    task_ids = []
+    for task_range in value.split(','):
+        if not task_range:
+            continue
+        step = 1
+        if ':' in task_range:
+            task_range, step = task_range.split(':', 1)
+            step = int(step)
+        if '-' in task_range:
+            first, last = task_range.split('-', 1)
+            task_ids += range(int(first), int(last) + 1, step)
+        else:
+            task_ids.append(int(task_range))
+    return task_ids
+
+
+def compress_ranges(numbers, use_step=True):
+    """
+    Compress integers into a list of `(first, last, step)` tuples.
+    If `use_step` is False, only consecutive integers are merged.
+    """
+    numbers = sorted(set(numbers))
+    ranges = []
+
+    i = 0
+    while i < len(numbers):
+        first = numbers[i]
+        if i + 1 < len(numbers) and use_step:
+            step = numbers[i + 1] - first
+        else:
+            step = 1
+
+        j = i
+        while j + 1 < len(numbers) and numbers[j + 1] - numbers[j] == step:
+            j += 1
+
+        if j == i + 1 and step != 1:
+            # do not make a range with stepped two values
+            j = i
+            step = 1
+        ranges.append((first, numbers[j], step))
+        i = j + 1
+
+    return ranges
+
+
+def format_ge_ranges(numbers):
+    """Format integers into UGE `n-m:s` notation."""
+    return ','.join(
+        "{}-{}:{}".format(first, last, step) for first, last, step in compress_ranges(numbers)
+    )
@@ -0,0 +1,115 @@
+from uge2slurm.utils.slurm import iter_command_lines
+from uge2slurm.utils.units import parse_duration, parse_memory, parse_datetime
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _to_str(value):
+    return value
+
+
+FINISHED_STATES = ("BOOT_FAIL", "CANCELLED", "COMPLETED", "DEADLINE", "FAILED", "NODE_FAIL",
+                   "OUT_OF_MEMORY", "PREEMPTED", "TIMEOUT")
+
+# (sacct field, record key, converter)
+FIELDS = (
+    ("JobIDRaw", "jobid", _to_str),
+    ("JobID", "jobid_str", _to_str),
+    ("User", "owner", _to_str),
+    ("Group", "group", _to_str),
+    ("Account", "account", _to_str),
+    ("WCKey", "project", _to_str),
+    ("Partition", "queue", _to_str),
+    ("NodeList", "hostname", _to_str),
+    ("Priority", "priority", _to_int),
+    ("Submit", "submit", parse_datetime),
+    ("Start", "start", parse_datetime),
+    ("End", "end", parse_datetime),
+    ("ElapsedRaw", "wallclock", _to_int),
+    ("UserCPU", "utime", parse_duration),
+    ("SystemCPU", "stime", parse_duration),
+    ("TotalCPU", "cpu", parse_duration),
+    ("AllocCPUS", "slots", _to_int),
+    ("NNodes", "nodes", _to_int),
+    ("MaxRSS", "maxrss", parse_memory),
+    ("MaxVMSize", "maxvmem", parse_memory),
+    ("ReqMem", "reqmem", _to_str),
+    ("Timelimit", "timelimit", parse_duration),
+    ("State", "state", _to_str),
+    ("ExitCode", "exit_code", _to_str),
+    ("JobName", "jobname", _to_str)  # job name must be the last one since it may contain the delimiter
+)
+RECORD_KEYS = tuple(key for _, key, _ in FIELDS if key != "jobid_str") + ("taskid", )
+FORMAT = ','.join(field for field, _, _ in FIELDS)
+_DELIMITER = '|'
+_STEP_KEYS = tuple(
+    (i, key, converter) for i, (_, key, converter) in enumerate(FIELDS) if key in ("maxrss", "maxvmem")
+)
+
+
+def _get_request_memory(value, slots, nodes):
+    """`ReqMem` may have `c` (per cpu) or `n` (per node) suffix in old Slurm."""
+    if not value:
+        return None
+    scale = 1
+    if value[-1] == 'c':
+        value, scale = value[:-1], slots or 1
+    elif value[-1] == 'n':
+        value, scale = value[:-1], nodes or 1
+    memory = parse_memory(value)
+    if memory is None:
+        return None
+    return memory * scale
+
+
+def _parse_values(values):
+    return dict((key, converter(value)) for (_, key, converter), value in zip(FIELDS, values))
+
+
+def _finish(record):
+    jobid_str = record.pop("jobid_str")
+    record["taskid"] = None
+    if '_' in jobid_str:
+        jobnumber, taskid = jobid_str.split('_', 1)
+        if taskid.isdigit():
+            record["jobid"] = jobnumber
+            record["taskid"] = int(taskid)
+    record["reqmem"] = _get_request_memory(record["reqmem"], record["slots"], record["nodes"])
+    return record
+
+
+def iter_records(args=()):
+    """
+    Yield one merged record per job (or array task) from `sacct` output.
+    Job steps follow their allocation line so that only the current job is kept
+    in memory and step values (e.g. MaxRSS) are merged into it.
+    """
+    sacct_args = ["--parsable2", "--noheader", "--format", FORMAT] + list(args)
+
+    current = None
+    for line in iter_command_lines("sacct", sacct_args):
+        if not line:
+            continue
+        values = line.split(_DELIMITER, len(FIELDS) - 1)
+        raw_id = values[0]
+
+        if '.' in raw_id:  # job step: only values which are not aggregated into allocation line
+            if current is not None and raw_id.split('.', 1)[0] == current_id:
+                for i, key, converter in _STEP_KEYS:
+                    value = converter(values[i])
+                    if value is not None and (current[key] is None or value > current[key]):
+                        current[key] = value
+            continue
+
+        if current is not None:
+            yield _finish(current)
+        current = _parse_values(values)
+        current_id = raw_id
+
+    if current is not None:
+        yield _finish(current)
@@ -0,0 +1,25 @@
+import re
+
+from uge2slurm.utils.slurm import iter_command_lines
+
+_KEY = re.compile(r"(?:^|\s)([A-Za-z][\w:/]*)=")
+
+
+def parse_kv_line(line):
+    """
+    Parse a `key=value key=value ...` line printed by `scontrol -o`.
+    Values may contain spaces (e.g. `JobName`) so that each value is taken
+    until the beginning of the next key.
+    """
+    record = {}
+    matches = list(_KEY.finditer(line))
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        end = len(line) if next_match is None else next_match.start()
+        record[match.group(1)] = line[match.end():end]
+    return record
+
+
+def iter_show(entity, args=()):
+    for line in iter_command_lines("scontrol", ["--oneliner", "show", entity] + list(args)):
+        if line and '=' in line:
+            yield parse_kv_line(line)
@@ -1,5 +1,6 @@
 import logging
-from subprocess import PIPE, CalledProcessError
+from tempfile import TemporaryFile
+from subprocess import Popen, PIPE, CalledProcessError
 from uge2slurm.utils.py2.subprocess import run
 
 from uge2slurm.utils.path import get_command_path
@@ -8,7 +9,7 @@ from uge2slurm.commands import UGE2slurmCommandError
 logger = logging.getLogger(__name__)
 
 
-def run_command(command_name, args, stdout=PIPE, stderr=PIPE):
+def run_command(command_name, args, stdout=PIPE, stderr=PIPE, input=None):
     if command_name is None:
         command_name = args[0]
         args = args[1:]
@@ -19,7 +20,7 @@ def run_command(command_name, args, stdout=PIPE, stderr=PIPE):
             raise OSError
         command = [binary] + args
         logger.debug("Run command: {}".format(command))
-        return run(command, stdout=stdout, stderr=stderr, check=True,
+        return run(command, stdout=stdout, stderr=stderr, input=input, check=True,
                    universal_newlines=True)
     except OSError:
         raise UGE2slurmCommandError("Command `{}` not found.".format(command_name))
@@ -27,3 +28,36 @@ def run_command(command_name, args, stdout=PIPE, stderr=PIPE):
         if e.stderr:
             logger.error(command_name + ": " + e.stderr)
         raise UGE2slurmCommandError("Failed to execute `{}` command.".format(command_name))
+
+
+def iter_command_lines(command_name, args):
+    """
+    Yield stdout lines of the command one by one without keeping whole output.
+    stderr is spooled into a temporary file to avoid pipe deadlock.
+    """
+    binary = get_command_path(command_name)
+    if not binary:
+        raise UGE2slurmCommandError("Command `{}` not found.".format(command_name))
+
+    command = [binary] + args
+    logger.debug("Run command: {}".format(command))
+
+    with TemporaryFile(mode="w+") as errfile:
+        try:
+            process = Popen(command, stdout=PIPE, stderr=errfile, universal_newlines=True)
+        except OSError:
+            raise UGE2slurmCommandError("Command `{}` not found.".format(command_name))
+
+        try:
+            for line in iter(process.stdout.readline, ''):
+                yield line.rstrip('\n')
+        finally:
+            process.stdout.close()
+            retcode = process.wait()
+
+        if retcode:
+            errfile.seek(0)
+            stderr = errfile.read()
+            if stderr:
+                logger.error(command_name + ": " + stderr)
+            raise UGE2slurmCommandError("Failed to execute `{}` command.".format(command_name))
@@ -0,0 +1,38 @@
+from collections import namedtuple
+
+from uge2slurm.utils.slurm import iter_command_lines
+
+_FIELDS = (
+    ("array_job_id", "%F"),
+    ("task_id", "%K"),
+    ("user", "%u"),
+    ("partition", "%P"),
+    ("state", "%t"),
+    ("reason", "%r"),
+    ("priority", "%p"),
+    ("submit_time", "%V"),
+    ("start_time", "%S"),
+    ("nodelist", "%N"),
+    ("cpus", "%C"),
+    ("time_limit", "%l"),
+    ("min_memory", "%m"),
+    ("name", "%j")  # job name must be the last one since it may contain the delimiter
+)
+_DELIMITER = '|'
+FORMAT = _DELIMITER.join(code for _, code in _FIELDS)
+
+Job = namedtuple("Job", [name for name, _ in _FIELDS])
+
+
+def _parse_line(line):
+    values = line.split(_DELIMITER, len(_FIELDS) - 1)
+    job = Job(*values)
+    if job.task_id == "N/A":
+        job = job._replace(task_id=None)
+    return job
+
+
+def iter_jobs(args=()):
+    for line in iter_command_lines("squeue", ["--noheader", "--format", FORMAT] + list(args)):
+        if line:
+            yield _parse_line(line)
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import hashlib
+from collections import namedtuple
+
+from uge2slurm.utils.path import DATA_DIR, get_data_path
+
+DEFAULT_LOG = "submissions.log"
+SPOOL_DIR = "spool"
+# the log is rotated to `submissions.log.1` when it exceeds this size and
+# records in the previous rotated log are dropped
+MAX_LOG_SIZE = 4 * 1024 * 1024
+# unreferenced spool files newer than this may be used by ongoing submissions
+SPOOL_GRACE = 3600
+
+_FIELDS = ("jobid", "submit", "cwd", "script_hash", "script_path", "stdin_hash", "env_hash", "argv")
+Submission = namedtuple("Submission", _FIELDS)
+
+
+def get_spool_path(data_hash):
+    return os.path.join(DATA_DIR, SPOOL_DIR, data_hash)
+
+
+def spool_data(data):
+    """Save data once per content and return its hash."""
+    data = data if isinstance(data, bytes) else data.encode("utf-8")
+    data_hash = hashlib.sha1(data).hexdigest()
+    path = get_data_path(SPOOL_DIR, data_hash)
+    try:
+        # keep the file from being pruned while it is used
+        os.utime(path, None)
+    except OSError:
+        # write into a temporary file and rename it not to expose partial contents
+        temp_path = "{}.{}".format(path, os.getpid())
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.rename(temp_path, path)
+    return data_hash
+
+
+def read_spool(data_hash, binary=False):
+    with open(get_spool_path(data_hash), "rb") as f:
+        data = f.read()
+    # python2 passes `str` to the process as it is
+    if binary or isinstance(data, str):
+        return data
+    return data.decode("utf-8")
+
+
+def record_submission(jobid, argv, script_hash=None, script_path=None, stdin=None, cwd=None):
+    """
+    Append a submission to the log as a tab separated line. The `sbatch` argv
+    is encoded in JSON, and stdin and the file of `--export-file` are spooled
+    by their hashes.
+    """
+    stdin_hash = spool_data(stdin) if stdin is not None else None
+    env_hash = None
+    if "--export-file" in argv:
+        path = argv[argv.index("--export-file") + 1]
+        if os.path.dirname(path) == os.path.join(DATA_DIR, SPOOL_DIR):
+            # written into the spool by qsub
+            env_hash = os.path.basename(path)
+        else:
+            with open(path, "rb") as f:
+                env_hash = spool_data(f.read())
+    if cwd is None:
+        cwd = os.getcwd()
+    if script_path is not None:
+        script_path = os.path.abspath(script_path)
+
+    fields = (jobid, str(int(time.time())), cwd, script_hash, script_path, stdin_hash, env_hash)
+    line = '\t'.join(field or '' for field in fields)
+    line += '\t' + json.dumps(list(argv), separators=(',', ':')) + '\n'
+    # a single write of a line is appended atomically by concurrent submissions
+    with open(get_data_path(DEFAULT_LOG), 'a') as f:
+        f.write(line)
+        size = f.tell()
+    if size > MAX_LOG_SIZE:
+        rotate_log()
+
+
+def rotate_log():
+    """
+    Move the log to `submissions.log.1`, which replaces the previous one, and
+    remove spooled files which are referenced by neither of the logs.
+    """
+    path = os.path.join(DATA_DIR, DEFAULT_LOG)
+    try:
+        os.rename(path, path + ".1")
+    except OSError:
+        # rotated by another submission
+        return
+
+    referenced = set()
+    for submission in _iter_log():
+        referenced.update((submission.stdin_hash, submission.env_hash))
+
+    spool_dir = os.path.join(DATA_DIR, SPOOL_DIR)
+    if not os.path.isdir(spool_dir):
+        return
+    expire = time.time() - SPOOL_GRACE
+    for name in os.listdir(spool_dir):
+        path = os.path.join(spool_dir, name)
+        try:
+            if name not in referenced and os.path.getmtime(path) < expire:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def _iter_log(jobids=None):
+    """Yield `Submission`s from the rotated log and then from the current one."""
+    for name in (DEFAULT_LOG + ".1", DEFAULT_LOG):
+        try:
+            f = open(os.path.join(DATA_DIR, name))
+        except (IOError, OSError):
+            continue
+
+        with f:
+            for line in f:
+                jobid, _, rest = line.partition('\t')
+                if jobids is not None and jobid not in jobids:
+                    continue
+                values = rest.rstrip('\n').split('\t', len(_FIELDS) - 2)
+                if len(values) != len(_FIELDS) - 1:
+                    continue
+                values = [value or None for value in values[:-1]] + [json.loads(values[-1])]
+                values[0] = int(values[0])
+                yield Submission(jobid, *values)
+
+
+def find_submissions(jobids):
+    """Return a dict of job ids and their latest `Submission` by a single pass of the logs."""
+    found = {}
+    for submission in _iter_log(set(jobids)):
+        found[submission.jobid] = submission
+    return found
@@ -0,0 +1,125 @@
+import time
+from datetime import datetime
+from functools import wraps
+
+_MEMORY_UNITS = dict(
+    K=1024,
+    M=1024 ** 2,
+    G=1024 ** 3,
+    T=1024 ** 4,
+    P=1024 ** 5
+)
+
+
+def memoize(maxsize=4096):
+    """
+    Cache results of single argument function. The cache is simply cleared
+    when it exceeds `maxsize` to keep the memory usage small.
+    """
+    def _maker(func):
+        cache = {}
+
+        @wraps(func)
+        def _inner(value):
+            try:
+                return cache[value]
+            except KeyError:
+                if len(cache) >= maxsize:
+                    cache.clear()
+                result = cache[value] = func(value)
+                return result
+        return _inner
+    return _maker
+
+
+@memoize()
+def parse_duration(value):
+    """Convert Slurm `[days-][[hours:]minutes:]seconds[.fraction]` into seconds."""
+    if not value or value in ("UNLIMITED", "INVALID", "Partition_Limit", "NONE", "N/A"):
+        return None
+
+    days = 0
+    if '-' in value:
+        days, value = value.split('-', 1)
+        days = int(days)
+
+    seconds = 0.
+    for field in value.split(':'):
+        seconds = seconds * 60 + float(field)
+
+    return days * 86400 + seconds
+
+
+@memoize()
+def parse_ge_duration(value):
+    """
+    Convert UGE time specifier like `3600`, `1:00:00` or `::3600` into
+    seconds. None is returned for `INFINITY`. ValueError is raised if the
+    value is not valid.
+    """
+    if value.upper() == "INFINITY":
+        return None
+
+    fields = value.split(':')
+    if len(fields) > 4:
+        raise ValueError('invalid time specifier: "{}"'.format(value))
+
+    seconds = 0
+    for field, scale in zip(reversed(fields), (1, 60, 3600, 86400)):
+        if field:
+            seconds += int(field) * scale
+    return seconds
+
+
+@memoize()
+def parse_memory(value):
+    """Convert Slurm memory string like `1234K` or `4G` (MB by default) into bytes."""
+    if not value or value in ("N/A", "None", "UNLIMITED"):
+        return None
+
+    unit = value[-1].upper()
+    if unit in _MEMORY_UNITS:
+        value = value[:-1]
+    elif unit == 'B':
+        unit, value = None, value[:-1]
+    else:
+        unit = 'M'
+
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if unit is None:
+        return int(number)
+    return int(number * _MEMORY_UNITS[unit])
+
+
+@memoize()
+def parse_datetime(value):
+    """Convert Slurm timestamp `YYYY-MM-DDThh:mm:ss` into UNIX time."""
+    try:
+        return int(time.mktime(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").timetuple()))
+    except (TypeError, ValueError):
+        return None
+
+
+def format_memory(value):
+    """Format bytes in UGE style like `1.234G`."""
+    if value is None:
+        return "0.000"
+    for unit in ('T', 'G', 'M', 'K'):
+        if value >= _MEMORY_UNITS[unit]:
+            return "{:.3f}{}".format(float(value) / _MEMORY_UNITS[unit], unit)
+    return "{:.3f}".format(value)
+
+
+def format_duration(seconds):
+    """Format seconds into Slurm `[days-]hours:minutes:seconds`."""
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    text = "{:02d}:{:02d}:{:02d}".format(hours, minutes, seconds)
+    if days:
+        text = "{}-{}".format(days, text)
+    return text